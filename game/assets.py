@@ -0,0 +1,199 @@
+"""
+Shared image assets for the game core.
+
+This module never imports an imaging or UI toolkit itself: decoding is done by
+an image backend installed by the rendering layer (see ui.adapter). Without a
+backend every lookup returns None, which keeps the core importable headless.
+
+AssetPreloader warms the cache in the background so screens find their images
+already decoded.
+"""
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Marks paths that were already looked up and do not exist on disk
+_MISSING = object()
+
+
+class AssetCache:
+    """Process-wide LRU cache of decoded images keyed by (path, size)."""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, max_entries=1024):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (value, nbytes)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, nbytes=0):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            # Entries bigger than the whole cache are returned but never kept
+            if nbytes > self.max_bytes:
+                return value
+            self._entries[key] = (value, nbytes)
+            self.current_bytes += nbytes
+            self._evict()
+            return value
+
+    def get_or_load(self, key, loader):
+        """Return the cached value for key, calling loader() -> (value, nbytes) on a miss."""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        value, nbytes = loader()
+        return self.put(key, value, nbytes)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    def _evict(self):
+        while self._entries and (self.current_bytes > self.max_bytes or len(self._entries) > self.max_entries):
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self.current_bytes -= nbytes
+
+
+# Shared by every card, avatar and screen in the process
+asset_cache = AssetCache()
+
+
+_backend = None
+
+
+def set_image_backend(backend):
+    """Install the object used to decode images.
+
+    A backend provides open(path, size) and placeholder(size, color), both
+    returning (image, nbytes); open raises FileNotFoundError for missing files.
+    """
+    global _backend
+    _backend = backend
+    asset_cache.clear()
+
+
+def get_image_backend():
+    return _backend
+
+
+def load_image(path, size, placeholder_color=None):
+    """Load path resized to size, sharing one decode per (path, size).
+
+    Falls back to a solid placeholder of placeholder_color when the file is
+    missing, or returns None if no placeholder color was given. Always returns
+    None when no image backend is installed.
+    """
+    backend = _backend
+    if backend is None:
+        return None
+    size = tuple(size)
+
+    def load():
+        try:
+            return backend.open(path, size)
+        except FileNotFoundError:
+            return _MISSING, 0
+
+    image = asset_cache.get_or_load((path, size), load)
+    if image is not _MISSING:
+        return image
+    if placeholder_color is None:
+        return None
+    return load_placeholder(size, placeholder_color)
+
+
+def load_placeholder(size, color):
+    """Solid color placeholder, cached like any other image."""
+    backend = _backend
+    if backend is None:
+        return None
+    size = tuple(size)
+    return asset_cache.get_or_load(("placeholder", color, size), lambda: backend.placeholder(size, color))
+
+
+class AssetPreloader:
+    """Decodes a list of (path, size) images on a thread pool to warm asset_cache.
+
+    Worker threads only call the backend's open(); the results are handed to the
+    owner thread by poll(), which a UI calls periodically (e.g. from Tk's after())
+    so the cache, and any widgets updated from on_loaded, are only touched there.
+    """
+
+    def __init__(self, jobs, workers=4, on_loaded=None):
+        self.jobs = [(path, tuple(size)) for path, size in jobs]
+        self.total = len(self.jobs)
+        self.done = 0
+        self.on_loaded = on_loaded
+        self._ready = queue.SimpleQueue()
+        backend = _backend
+        if backend is None or not self.jobs:
+            self.done = self.total
+            return
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="asset-preload")
+        for path, size in self.jobs:
+            executor.submit(self._decode, backend, path, size)
+        executor.shutdown(wait=False)
+
+    @property
+    def progress(self):
+        return self.done / self.total if self.total else 1.0
+
+    @property
+    def finished(self):
+        return self.done >= self.total
+
+    def poll(self):
+        """Move finished decodes into asset_cache; returns the progress so far."""
+        while True:
+            try:
+                path, size, image, nbytes = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            self.done += 1
+            if image is None:
+                continue  # Could not be decoded; load_image will try again on demand
+            asset_cache.put((path, size), image, nbytes)
+            if self.on_loaded and image is not _MISSING:
+                self.on_loaded(path, size, image)
+        return self.progress
+
+    def _decode(self, backend, path, size):
+        try:
+            image, nbytes = backend.open(path, size)
+        except FileNotFoundError:
+            image, nbytes = _MISSING, 0
+        except Exception:
+            image, nbytes = None, 0
+        self._ready.put((path, size, image, nbytes))
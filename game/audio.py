@@ -0,0 +1,147 @@
+"""
+Audio hooks for the game core.
+
+No audio library is imported here. Headless processes (servers, simulations,
+tests) run silently; the UI installs a backend such as ui.adapter's pygame
+backend to actually decode and play sounds.
+
+Game code plays sounds by name through sound_bank. Each file is decoded once,
+on a background thread, and play() never waits for disk or the decoder.
+"""
+import os
+import queue
+import threading
+
+SOUND_DIR = "assets/sounds"
+
+_backend = None
+_MISSING = object()
+
+
+def set_audio_backend(backend):
+    """Install an object with load(path), returning a playable sound or None, and set_channels(count).
+
+    Passing None turns audio off again.
+    """
+    global _backend
+    _backend = backend
+    sound_bank.reset()
+
+
+def get_audio_backend():
+    return _backend
+
+
+def audio_enabled():
+    return _backend is not None
+
+
+def load_sound(path):
+    # Synchronous decode; only the sound bank's loader thread should call this
+    if _backend is None:
+        return None
+    return _backend.load(path)
+
+
+class SoundBank:
+    """Named sounds, decoded once in the background and played on a bounded set of channels.
+
+    Names map to assets/sounds/<name>.mp3 unless registered with another path.
+    play() on a sound that is still decoding queues it and plays it once ready.
+    With no backend installed, or with enabled set to False, every call is a no-op.
+    """
+
+    def __init__(self, channels=8, sound_dir=SOUND_DIR):
+        self.channels = channels
+        self.sound_dir = sound_dir
+        self.enabled = True
+        self._paths = {}
+        self._sounds = {}  # name -> decoded sound, or None if it could not be loaded
+        self._queued = set()
+        self._play_when_ready = set()
+        self._generation = 0  # Bumped on reset so stale decodes are dropped
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def active(self):
+        return self.enabled and _backend is not None
+
+    def register(self, name, path):
+        self._paths[name] = path
+
+    def path(self, name):
+        return self._paths.get(name) or os.path.join(self.sound_dir, f"{name}.mp3")
+
+    def preload(self, names):
+        """Queue sounds for decoding without playing them."""
+        if not self.active:
+            return
+        with self._lock:
+            for name in names:
+                self._request(name)
+
+    def play(self, name):
+        """Play a sound if it is ready; returns immediately either way."""
+        if not self.active:
+            return False
+        with self._lock:
+            sound = self._sounds.get(name, _MISSING)
+            if sound is _MISSING:
+                self._play_when_ready.add(name)
+                self._request(name)
+                return False
+        return self._play(sound)
+
+    def reset(self):
+        """Forget decoded sounds, e.g. after the backend changed."""
+        with self._lock:
+            self._generation += 1
+            self._sounds.clear()
+            self._queued.clear()
+            self._play_when_ready.clear()
+        if _backend is not None:
+            _backend.set_channels(self.channels)
+
+    def _request(self, name):
+        # Caller holds the lock
+        if name in self._sounds or name in self._queued:
+            return
+        self._queued.add(name)
+        self._queue.put((self._generation, name, self.path(name)))
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._load_loop, name="sound-bank", daemon=True)
+            self._thread.start()
+
+    def _load_loop(self):
+        while True:
+            generation, name, path = self._queue.get()
+            try:
+                sound = load_sound(path)
+            except Exception:
+                sound = None
+            if sound is None:
+                print(f"Warning: Sound file {path} not found or could not be loaded.")
+            with self._lock:
+                if generation != self._generation:
+                    continue
+                self._queued.discard(name)
+                self._sounds[name] = sound
+                play_now = name in self._play_when_ready
+                self._play_when_ready.discard(name)
+            if play_now:
+                self._play(sound)
+
+    def _play(self, sound):
+        if sound is None:
+            return False
+        try:
+            # Returns no channel when all of them are busy; the sound is simply skipped
+            return sound.play() is not None
+        except Exception:
+            return False  # Ignore sound playing errors
+
+
+# One bank per process
+sound_bank = SoundBank()
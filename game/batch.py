@@ -0,0 +1,238 @@
+"""
+Vectorized batch battle simulator for balance testing.
+
+Decks are packed into structure-of-arrays NumPy buffers and N battles are
+resolved in lock-step, one turn per iteration. The rules mirror Battle.steps()
+exactly: for the same decks and seeds, simulate_battles() produces the same
+winners, health and turn counts as running Battle(...).start() N times.
+
+NumPy is only needed by this module; the rest of the game core does not use it.
+"""
+import random
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError("game.batch needs NumPy; install it with `pip install royal_clash[batch]` "
+                      "or `pip install numpy`") from e
+
+# Ability type codes used in the packed arrays
+ABILITY_NONE = 0
+ABILITY_HEAL = 1
+ABILITY_BUFF = 2
+ABILITY_DEBUFF = 3
+ABILITY_DAMAGE = 4
+
+ABILITY_CODES = {
+    "heal": ABILITY_HEAL,
+    "buff": ABILITY_BUFF,
+    "debuff": ABILITY_DEBUFF,
+    "damage": ABILITY_DAMAGE
+}
+
+_NO_CARD = np.iinfo(np.int64).min
+
+
+class PackedDecks:
+    """One side of N battles as structure-of-arrays of shape (N, deck_size)."""
+
+    def __init__(self, decks, orders):
+        n = len(decks)
+        size = max((len(deck) for deck in decks), default=0)
+        self.attack = np.zeros((n, size), dtype=np.int64)
+        self.defense = np.zeros((n, size), dtype=np.int64)
+        self.cost = np.zeros((n, size), dtype=np.int64)
+        self.ability_type = np.zeros((n, size), dtype=np.int64)
+        self.ability_value = np.zeros((n, size), dtype=np.int64)
+        # Number of turns an applied buff/debuff stays active
+        self.ability_duration = np.ones((n, size), dtype=np.int64)
+        self.in_hand = np.zeros((n, size), dtype=bool)
+
+        for row, (deck, order) in enumerate(zip(decks, orders)):
+            for slot, index in enumerate(order):
+                card = deck[index]
+                self.attack[row, slot] = card.attack
+                self.defense[row, slot] = card.defense
+                self.cost[row, slot] = card.cost
+                self.in_hand[row, slot] = True
+                ability = card.special_ability
+                if ability:
+                    code = ABILITY_CODES.get(ability["type"], ABILITY_NONE)
+                    self.ability_type[row, slot] = code
+                    self.ability_value[row, slot] = ability.get("value", 0)
+                    if code in (ABILITY_BUFF, ABILITY_DEBUFF):
+                        self.ability_duration[row, slot] = max(ability.get("duration", 1), 1)
+
+    @property
+    def size(self):
+        return self.attack.shape[1]
+
+
+class _Side:
+    """Mutable battle state for one side of every battle in the batch."""
+
+    def __init__(self, packed, n, effect_slots):
+        self.packed = packed
+        self.defense = packed.defense.copy()
+        self.in_hand = packed.in_hand.copy()
+        self.mana = np.full(n, 5, dtype=np.int64)
+        self.health = np.full(n, 1000, dtype=np.int64)
+        # Field is a queue of card slots: cards enter at tail, die at head
+        self.field = np.zeros((n, max(packed.size, 1)), dtype=np.int64)
+        self.head = np.zeros(n, dtype=np.int64)
+        self.tail = np.zeros(n, dtype=np.int64)
+        # effects[row, slot, k] is the net value of effects with k + 1 ticks left
+        self.effects = np.zeros((n, max(packed.size, 1), effect_slots), dtype=np.int64)
+
+    def field_size(self):
+        return self.tail - self.head
+
+    def front(self, rows):
+        return self.field[rows, self.head[rows]]
+
+
+def _shuffle_orders(decks1, decks2, seeds):
+    # Same draw order as Battle: one Random per seed, shuffling player 1 first
+    orders1 = []
+    orders2 = []
+    for deck1, deck2, seed in zip(decks1, decks2, seeds):
+        rng = random.Random(seed)
+        order1 = list(range(len(deck1)))
+        order2 = list(range(len(deck2)))
+        rng.shuffle(order1)
+        rng.shuffle(order2)
+        orders1.append(order1)
+        orders2.append(order2)
+    return orders1, orders2
+
+
+def _deploy(side, active):
+    packed = side.packed
+    if packed.size == 0:
+        return
+    field_size = side.field_size()[:, None]
+    # Same preference as Battle._play_strategic_card; cards in hand are never
+    # damaged, so their packed stats are their current stats
+    key = np.where(field_size == 0, packed.attack,
+                   np.where(field_size >= 3, packed.defense, packed.attack + packed.defense))
+    playable = side.in_hand & (packed.cost <= side.mana[:, None]) & active[:, None]
+    pick = np.argmax(np.where(playable, key, _NO_CARD), axis=1)
+    rows = np.nonzero(playable.any(axis=1))[0]
+    if not len(rows):
+        return
+    slots = pick[rows]
+    side.in_hand[rows, slots] = False
+    side.field[rows, side.tail[rows]] = slots
+    side.tail[rows] += 1
+    side.mana[rows] -= packed.cost[rows, slots]
+
+
+def _process_effects(side, rows, slots):
+    pending = side.effects[rows, slots]
+    side.defense[rows, slots] += pending.sum(axis=1)
+    shifted = np.zeros_like(pending)
+    shifted[:, :-1] = pending[:, 1:]
+    side.effects[rows, slots] = shifted
+
+
+def _attack(attacker, defender, rows, attacker_slots, defender_slots):
+    packed = attacker.packed
+    defender.defense[rows, defender_slots] -= packed.attack[rows, attacker_slots]
+
+    ability = packed.ability_type[rows, attacker_slots]
+    value = packed.ability_value[rows, attacker_slots]
+
+    heal = ability == ABILITY_HEAL
+    if heal.any():
+        r, s = rows[heal], defender_slots[heal]
+        current = defender.defense[r, s]
+        defender.defense[r, s] = np.minimum(current + value[heal], current * 2)
+
+    damage = ability == ABILITY_DAMAGE
+    if damage.any():
+        defender.defense[rows[damage], defender_slots[damage]] -= value[damage]
+
+    for code, sign in ((ABILITY_BUFF, 1), (ABILITY_DEBUFF, -1)):
+        mask = ability == code
+        if mask.any():
+            ticks = packed.ability_duration[rows[mask], attacker_slots[mask]]
+            defender.effects[rows[mask], defender_slots[mask], ticks - 1] += sign * value[mask]
+
+
+def _pop_defeated(side, rows, slots):
+    dead = side.defense[rows, slots] <= 0
+    side.head[rows[dead]] += 1
+
+
+def simulate_battles(decks1, decks2, seeds, max_turns=10):
+    """Resolve len(seeds) battles between decks1[i] and decks2[i] in lock-step.
+
+    Decks are sequences of cards (anything with attack, defense, cost and
+    special_ability, e.g. Card or CardDefinition). Returns a dict of arrays:
+    player1_wins, player1_health, player2_health and turns.
+    """
+    seeds = list(seeds)
+    n = len(seeds)
+    if len(decks1) != n or len(decks2) != n:
+        raise ValueError("decks1, decks2 and seeds must have the same length")
+
+    orders1, orders2 = _shuffle_orders(decks1, decks2, seeds)
+    packed1 = PackedDecks(decks1, orders1)
+    packed2 = PackedDecks(decks2, orders2)
+    effect_slots = int(max(packed1.ability_duration.max(initial=1), packed2.ability_duration.max(initial=1)))
+
+    side1 = _Side(packed1, n, effect_slots)
+    side2 = _Side(packed2, n, effect_slots)
+
+    turns = np.zeros(n, dtype=np.int64)
+    active = np.ones(n, dtype=bool)
+
+    for _ in range(max_turns):
+        cards_left = (side1.in_hand.any(axis=1) | (side1.field_size() > 0)
+                      | side2.in_hand.any(axis=1) | (side2.field_size() > 0))
+        active &= (side1.health > 0) & (side2.health > 0) & cards_left
+        if not active.any():
+            break
+
+        side1.mana[active] = np.minimum(10, side1.mana[active] + 1)
+        side2.mana[active] = np.minimum(10, side2.mana[active] + 1)
+        _deploy(side1, active)
+        _deploy(side2, active)
+
+        has1 = active & (side1.field_size() > 0)
+        has2 = active & (side2.field_size() > 0)
+
+        rows1 = np.nonzero(has1)[0]
+        rows2 = np.nonzero(has2)[0]
+        front1 = side1.front(rows1)
+        front2 = side2.front(rows2)
+        _process_effects(side1, rows1, front1)
+        _process_effects(side2, rows2, front2)
+
+        # Both sides have a front card: attack, counter-attack if alive, remove the dead
+        both = np.nonzero(has1 & has2)[0]
+        if len(both):
+            slots1 = side1.front(both)
+            slots2 = side2.front(both)
+            _attack(side1, side2, both, slots1, slots2)
+            alive = side2.defense[both, slots2] > 0
+            _attack(side2, side1, both[alive], slots2[alive], slots1[alive])
+            _pop_defeated(side1, both, slots1)
+            _pop_defeated(side2, both, slots2)
+
+        # Unopposed front cards hit the opposing player
+        for side, other, mask in ((side1, side2, has1 & ~has2), (side2, side1, has2 & ~has1)):
+            rows = np.nonzero(mask)[0]
+            if len(rows):
+                slots = side.front(rows)
+                other.health[rows] -= side.packed.attack[rows, slots]
+                _pop_defeated(side, rows, slots)
+
+        turns += active
+
+    return {
+        "player1_wins": side1.health > side2.health,
+        "player1_health": side1.health,
+        "player2_health": side2.health,
+        "turns": turns
+    }
@@ -1,105 +1,194 @@
-import random
+from bisect import bisect_right
+from collections import deque
 from datetime import datetime
-import json
-import time
+from game.history import BattleHistoryStore, PlayerStatsIndex
+from game.rng import resolve_rng
+
+class HandIndex:
+    """The cards of a hand sorted by cost, so playable cards are found by bisecting on mana.
+
+    Entries keep each card's draw position, which still decides ties.
+    """
+
+    def __init__(self, hand):
+        self.entries = sorted((card.cost, position, card) for position, card in enumerate(hand))
+        self.costs = [cost for cost, _, _ in self.entries]
+
+    def playable(self, mana):
+        return self.entries[:bisect_right(self.costs, mana)]
+
+    def remove(self, card):
+        for i, (_, _, entry_card) in enumerate(self.entries):
+            if entry_card is card:
+                del self.entries[i]
+                del self.costs[i]
+                return
 
 class Battle:
-    def __init__(self, player1, player2):
+    def __init__(self, player1, player2, max_turns=10, log_limit=200, seed=None, rng=None):
         self.player1 = player1
         self.player2 = player2
+        # The seed is part of the result, so any battle can be replayed exactly
+        self.rng, self.seed = resolve_rng(seed, rng)
         self.turn = 1
-        self.max_turns = 10  # Increased max turns for more strategic gameplay
+        self.max_turns = max_turns  # Increased max turns for more strategic gameplay
         self.player1_mana = 5
         self.player2_mana = 5
         self.player1_health = 1000
         self.player2_health = 1000
+        # Battle-time state for each deck; the players' collection cards are never mutated
+        self.player1_hand = [card.instantiate() for card in player1.deck]
+        self.player2_hand = [card.instantiate() for card in player2.deck]
+        # Draw order decides ties between equally strong cards
+        self.rng.shuffle(self.player1_hand)
+        self.rng.shuffle(self.player2_hand)
+        self.hand_index = {1: HandIndex(self.player1_hand), 2: HandIndex(self.player2_hand)}
         self.player1_field = []  # Cards on the field
         self.player2_field = []  # Cards on the field
-        self.log = []
+        # Only the most recent entries are kept, so long formats stay bounded
+        self.log = deque(maxlen=log_limit)
         self.winner = None
-        self.animation_queue = []  # Queue for battle animations
+        self.finished = False
+        self.animation_queue = deque(maxlen=log_limit)  # Queue for battle animations
+
+    def start(self, on_event=None):
+        """Run the battle to the end; on_event, if given, receives every event from steps()."""
+        for event in self.steps():
+            if on_event:
+                on_event(event)
+        return self.get_battle_result()
+
+    def steps(self):
+        """Run the battle one turn at a time, yielding a structured event per turn.
 
-    def start(self):
+        The last event has type "end" and carries the battle result.
+        """
         self.log.append(f"Battle started between {self.player1.username} and {self.player2.username}")
-        return self.play_turn()
+        while not self.finished:
+            if self.turn > self.max_turns or self._is_over():
+                yield {"type": "end", "turn": self.turn - 1, "result": self.end_battle()}
+                return
+            yield self.play_turn()
 
     def play_turn(self):
-        if self.turn > self.max_turns:
-            return self.end_battle()
+        """Play a single turn and return its event."""
+        actions = []
 
         # Increase mana each turn
         self.player1_mana = min(10, self.player1_mana + 1)
         self.player2_mana = min(10, self.player2_mana + 1)
 
+        # Each side deploys at most one card per turn
+        self.player1_mana = self._deploy(1, self.player1_hand, self.player1_mana, self.player1_field, actions)
+        self.player2_mana = self._deploy(2, self.player2_hand, self.player2_mana, self.player2_field, actions)
+
         # Get active cards
         player_card = self.player1_field[0] if self.player1_field else None
         enemy_card = self.player2_field[0] if self.player2_field else None
-        
-        if not player_card or not enemy_card:
-            return False
-            
+
+        if player_card and enemy_card:
+            self._fight(player_card, enemy_card, actions)
+        elif player_card:
+            self._direct_attack(1, player_card, self.player1_field, actions)
+        elif enemy_card:
+            self._direct_attack(2, enemy_card, self.player2_field, actions)
+
+        # Reduce cooldowns
+        for card in self.player1_field + self.player2_field:
+            if card.cooldown > 0:
+                card.cooldown -= 1
+
+        event = {
+            "type": "turn",
+            "turn": self.turn,
+            "actions": actions,
+            "player1_mana": self.player1_mana,
+            "player2_mana": self.player2_mana,
+            "player1_health": self.player1_health,
+            "player2_health": self.player2_health
+        }
+        self.turn += 1
+        return event
+
+    def _is_over(self):
+        if self.player1_health <= 0 or self.player2_health <= 0:
+            return True
+        # Nothing left to play on either side
+        return not (self.player1_hand or self.player1_field or self.player2_hand or self.player2_field)
+
+    def _deploy(self, side, hand, mana, field, actions):
+        card = self._play_strategic_card(self.hand_index[side], mana, field)
+        if card is None:
+            return mana
+        hand.remove(card)
+        self.hand_index[side].remove(card)
+        field.append(card)
+        self.log.append(f"{card.name} enters the field")
+        actions.append({"type": "play", "player": side, "card": card.name, "cost": card.cost})
+        return mana - card.cost
+
+    def _fight(self, player_card, enemy_card, actions):
         # Process effects
         player_card.process_effects()
         enemy_card.process_effects()
-        
+
         # Player card attacks enemy card
-        damage = player_card.attack
-        enemy_card.defense -= damage
-        self.log.append(f"{player_card.name} deals {damage} damage to {enemy_card.name}")
-        
+        self._attack(player_card, enemy_card, actions)
+
+        # Enemy card counter-attacks if still alive
+        if enemy_card.defense > 0:
+            self._attack(enemy_card, player_card, actions)
+
+        # Remove defeated cards
+        if player_card.defense <= 0:
+            self._defeat(self.player1_field, actions)
+        if enemy_card.defense <= 0:
+            self._defeat(self.player2_field, actions)
+
+    def _attack(self, attacker, defender, actions):
+        damage = attacker.attack
+        defender.defense -= damage
+        self.log.append(f"{attacker.name} deals {damage} damage to {defender.name}")
+        actions.append({"type": "attack", "attacker": attacker.name, "defender": defender.name, "damage": damage})
+
         # Use special ability if available
-        if player_card.special_ability:
-            effect = player_card.use_special_ability(enemy_card)
+        if attacker.special_ability:
+            effect = attacker.use_special_ability(defender)
             if effect:
-                self.log.append(f"{player_card.name} {effect}")
+                self.log.append(f"{attacker.name} {effect}")
+                actions.append({"type": "special_ability", "card": attacker.name, "effect": effect})
                 self.animation_queue.append({
                     "type": "special_ability",
-                    "card": player_card,
+                    "card": attacker,
                     "effect": effect
                 })
-        
-        # Enemy card counter-attacks if still alive
-        if enemy_card.defense > 0:
-            damage = enemy_card.attack
-            player_card.defense -= damage
-            self.log.append(f"{enemy_card.name} deals {damage} damage to {player_card.name}")
-            
-            # Enemy uses special ability if available
-            if enemy_card.special_ability:
-                effect = enemy_card.use_special_ability(player_card)
-                if effect:
-                    self.log.append(f"{enemy_card.name} {effect}")
-                    self.animation_queue.append({
-                        "type": "special_ability",
-                        "card": enemy_card,
-                        "effect": effect
-                    })
-        
-        # Remove defeated cards
-        if player_card.defense <= 0:
-            self.log.append(f"{player_card.name} was defeated!")
-            self.player1_field.pop(0)
-            
-        if enemy_card.defense <= 0:
-            self.log.append(f"{enemy_card.name} was defeated!")
-            self.player2_field.pop(0)
-            
-        # Reduce cooldowns
-        for card in self.player1_field + self.player2_field:
-            if card.cooldown > 0:
-                card.cooldown -= 1
-                
-        self.turn += 1
 
-        # Check if battle should end
-        if self.player1_health <= 0 or self.player2_health <= 0:
-            return self.end_battle()
+    def _direct_attack(self, side, card, field, actions):
+        # An unopposed card hits the opposing player directly
+        card.process_effects()
+        damage = card.attack
+        if side == 1:
+            self.player2_health -= damage
+        else:
+            self.player1_health -= damage
+        self.log.append(f"{card.name} attacked opponent directly for {damage} damage")
+        actions.append({"type": "direct_attack", "player": side, "card": card.name, "damage": damage})
+        self.animation_queue.append({
+            "type": "direct_attack",
+            "card": card,
+            "damage": damage
+        })
+        if card.defense <= 0:
+            self._defeat(field, actions)
 
-        return self.play_turn()
+    def _defeat(self, field, actions):
+        card = field.pop(0)
+        self.log.append(f"{card.name} was defeated!")
+        actions.append({"type": "defeated", "card": card.name})
 
-    def _play_strategic_card(self, player, available_mana, field):
+    def _play_strategic_card(self, hand_index, available_mana, field):
         # Get playable cards
-        playable_cards = [card for card in player.deck if card.cost <= available_mana]
+        playable_cards = hand_index.playable(available_mana)
         
         if not playable_cards:
             return None
@@ -107,13 +196,16 @@ class Battle:
         # Basic AI strategy
         if len(field) == 0:
             # If field is empty, prefer high attack cards
-            return max(playable_cards, key=lambda x: x.attack)
+            strength = lambda x: x.attack
         elif len(field) >= 3:
             # If field is crowded, prefer high defense cards
-            return max(playable_cards, key=lambda x: x.defense)
+            strength = lambda x: x.defense
         else:
             # Otherwise, balance attack and defense
-            return max(playable_cards, key=lambda x: (x.attack + x.defense) / 2)
+            strength = lambda x: (x.attack + x.defense) / 2
+        # Ties go to the card drawn first
+        _, _, card = max(playable_cards, key=lambda entry: (strength(entry[2]), -entry[1]))
+        return card
 
     def _process_card_effects(self, card, owner, opponent):
         # Process special abilities
@@ -127,73 +219,8 @@ class Battle:
                     "effect": effect
                 })
 
-    def _resolve_battles(self):
-        # Pair up cards for battle
-        while self.player1_field and self.player2_field:
-            p1_card = self.player1_field[0]
-            p2_card = self.player2_field[0]
-
-            # Calculate damage
-            p1_damage = p1_card.attack
-            p2_damage = p2_card.attack
-
-            # Apply damage
-            p2_card.defense -= p1_damage
-            p1_card.defense -= p2_damage
-
-            # Log the battle
-            self.log.append(f"{p1_card.name} attacked {p2_card.name} for {p1_damage} damage")
-            self.log.append(f"{p2_card.name} attacked {p1_card.name} for {p2_damage} damage")
-
-            # Add to animation queue
-            self.animation_queue.append({
-                "type": "battle",
-                "attacker": p1_card,
-                "defender": p2_card,
-                "damage": p1_damage
-            })
-            self.animation_queue.append({
-                "type": "battle",
-                "attacker": p2_card,
-                "defender": p1_card,
-                "damage": p2_damage
-            })
-
-            # Remove destroyed cards
-            if p1_card.defense <= 0:
-                self.player1_field.pop(0)
-                self.log.append(f"{p1_card.name} was destroyed")
-            if p2_card.defense <= 0:
-                self.player2_field.pop(0)
-                self.log.append(f"{p2_card.name} was destroyed")
-
-        # Remaining cards attack opponent directly
-        for card in self.player1_field:
-            damage = card.attack
-            self.player2_health -= damage
-            self.log.append(f"{card.name} attacked opponent directly for {damage} damage")
-            self.animation_queue.append({
-                "type": "direct_attack",
-                "card": card,
-                "damage": damage
-            })
-
-        for card in self.player2_field:
-            damage = card.attack
-            self.player1_health -= damage
-            self.log.append(f"{card.name} attacked opponent directly for {damage} damage")
-            self.animation_queue.append({
-                "type": "direct_attack",
-                "card": card,
-                "damage": damage
-            })
-
-    def _cleanup_field(self):
-        # Remove any cards with 0 or less defense
-        self.player1_field = [card for card in self.player1_field if card.defense > 0]
-        self.player2_field = [card for card in self.player2_field if card.defense > 0]
-
     def end_battle(self):
+        self.finished = True
         if self.player1_health > self.player2_health:
             self.winner = self.player1
             self.player1.earn_trophies(30)
@@ -215,33 +242,38 @@ class Battle:
             "winner": self.winner.username if self.winner else None,
             "player1_health": self.player1_health,
             "player2_health": self.player2_health,
-            "turns": self.turn,
-            "log": self.log,
-            "animations": self.animation_queue
+            "turns": self.turn - 1,
+            "seed": self.seed,
+            "log": list(self.log),
+            "animations": list(self.animation_queue)
         }
 
 class BattleManager:
-    def __init__(self):
+    def __init__(self, history_dir="data/battle_history"):
         self.battles = {}
+        self.history_dir = history_dir
         self.load_battle_history()
 
+    @property
+    def battle_history(self):
+        # Iterable over every recorded battle, oldest first
+        return self.history
+
     def load_battle_history(self):
-        try:
-            with open("data/battle_history.json", "r") as f:
-                self.battle_history = json.load(f)
-        except FileNotFoundError:
-            self.battle_history = []
+        # Opening the store only reads its segment index and active segment
+        self.history = BattleHistoryStore(self.history_dir)
+        self.stats = PlayerStatsIndex(self.history)
 
     def save_battle_history(self):
-        with open("data/battle_history.json", "w") as f:
-            json.dump(self.battle_history, f, indent=4)
+        self.history.sync()
+        self.stats.save()
 
-    def start_battle(self, player1, player2):
+    def start_battle(self, player1, player2, seed=None, rng=None, on_event=None):
         if not player1.deck or not player2.deck:
             return None, "Players need to have a deck to battle"
 
-        battle = Battle(player1, player2)
-        result = battle.start()
+        battle = Battle(player1, player2, seed=seed, rng=rng)
+        result = battle.start(on_event)
         
         # Save battle to history
         battle_record = {
@@ -250,31 +282,44 @@ class BattleManager:
             "player2": player2.username,
             "winner": result["winner"],
             "turns": result["turns"],
+            "seed": result["seed"],
             "player1_health": result["player1_health"],
             "player2_health": result["player2_health"]
         }
-        self.battle_history.append(battle_record)
-        self.save_battle_history()
+        # One small append per battle; fsyncs are batched by the store
+        self.history.append(battle_record)
+        self.stats.record(battle_record)
 
         return result, "Battle completed"
 
-    def get_player_battle_history(self, username):
+    def get_player_battle_history(self, username, limit=None):
+        # Recent battles come from the stats index; the full history needs a scan
+        if limit is not None and limit <= self.stats.recent_size:
+            return self.stats.recent(username)[-limit:] if limit else []
         return [battle for battle in self.battle_history 
                 if battle["player1"] == username or battle["player2"] == username]
 
     def get_player_stats(self, username):
-        battles = self.get_player_battle_history(username)
-        wins = sum(1 for battle in battles if battle["winner"] == username)
-        losses = len(battles) - wins
-        
+        stats = self.stats.get(username)
+        if not stats:
+            return {
+                "total_battles": 0,
+                "wins": 0,
+                "losses": 0,
+                "win_rate": 0,
+                "average_turns": 0,
+                "total_damage_dealt": 0
+            }
+
+        battles = stats["battles"]
         return {
-            "total_battles": len(battles),
-            "wins": wins,
-            "losses": losses,
-            "win_rate": (wins / len(battles) * 100) if battles else 0,
-            "average_turns": sum(battle["turns"] for battle in battles) / len(battles) if battles else 0,
-            "total_damage_dealt": sum(
-                battle["player2_health"] if battle["player1"] == username else battle["player1_health"]
-                for battle in battles
-            ) if battles else 0
+            "total_battles": battles,
+            "wins": stats["wins"],
+            "losses": battles - stats["wins"],
+            "win_rate": stats["wins"] / battles * 100,
+            "average_turns": stats["turns"] / battles,
+            "total_damage_dealt": stats["damage"]
         }
+
+    def get_leaderboard(self, limit=10, key="wins"):
+        return [(username, self.get_player_stats(username)) for username in self.stats.top(limit, key)]
@@ -1,11 +1,13 @@
 import json
-import random
+from bisect import bisect_right
+from dataclasses import dataclass
 from enum import Enum
-from PIL import Image
-import pygame
-from PIL import Image, ImageTk
-import customtkinter as ctk
+from functools import cached_property
+from types import MappingProxyType
 import os
+from game.assets import load_image
+from game.audio import sound_bank
+from game.rng import resolve_rng
 
 class CardRarity(Enum):
     COMMON = "Common"
@@ -18,54 +20,108 @@ class CardType(Enum):
     SPELL = "Spell"
     BUILDING = "Building"
 
+@dataclass(frozen=True, eq=False)
+class CardDefinition:
+    """Immutable, shared definition of a card; one per card id."""
+    id: object
+    name: str
+    rarity: object
+    type: object
+    attack: int
+    defense: int
+    cost: int
+    description: str
+    special_ability: object = None
+    element: object = None
+
+    def __post_init__(self):
+        if self.special_ability is not None and not isinstance(self.special_ability, MappingProxyType):
+            object.__setattr__(self, "special_ability", MappingProxyType(dict(self.special_ability)))
+
 class Card:
+    """A card in a player's collection: a shared definition plus level progression."""
+
     def __init__(self, id, name, rarity, type, attack, defense, cost, description, special_ability=None):
-        self.id = id
-        self.name = name
-        self.rarity = rarity
-        self.type = type
+        self.definition = CardDefinition(
+            id=id,
+            name=name,
+            rarity=rarity,
+            type=type,
+            attack=attack,
+            defense=defense,
+            cost=cost,
+            description=description,
+            special_ability=special_ability
+        )
         self.attack = attack
         self.defense = defense
         self.cost = cost
-        self.description = description
-        self.special_ability = special_ability
         self.level = 1
         self.experience = 0
-        self.image = None
-        self.animation = None
-        self.effects = []  # List of active effects on the card
-        self.cooldown = 0  # Cooldown for special abilities
-        self.element = None
-        self.effect = None
-        self.sound = None
-        self.load_assets()
+
+    @classmethod
+    def from_definition(cls, definition):
+        card = cls.__new__(cls)
+        card.definition = definition
+        card.attack = definition.attack
+        card.defense = definition.defense
+        card.cost = definition.cost
+        card.level = 1
+        card.experience = 0
+        return card
+
+    # Static data lives on the shared definition
+    id = property(lambda self: self.definition.id)
+    name = property(lambda self: self.definition.name)
+    rarity = property(lambda self: self.definition.rarity)
+    type = property(lambda self: self.definition.type)
+    description = property(lambda self: self.definition.description)
+    special_ability = property(lambda self: self.definition.special_ability)
+    element = property(lambda self: self.definition.element)
+
+    def to_dict(self):
+        # Static data is not saved; it comes back from the catalog by id
+        return {
+            "id": self.id,
+            "attack": self.attack,
+            "defense": self.defense,
+            "cost": self.cost,
+            "level": self.level,
+            "experience": self.experience
+        }
+
+    @classmethod
+    def from_dict(cls, data, definition):
+        """Rebuild a saved card on its shared definition (looked up by data["id"])."""
+        card = cls.from_definition(definition)
+        card.attack = data["attack"]
+        card.defense = data["defense"]
+        card.cost = data["cost"]
+        card.level = data["level"]
+        card.experience = data["experience"]
+        return card
+
+    def instantiate(self):
+        """Fresh battle-time state for this card; the collection card is never mutated in battle."""
+        return CardInstance(self.definition, self.attack, self.defense, self.cost, self.level)
+
+    # Assets are resolved on first access from the UI layer, so cards that are
+    # only used for battle math or persistence never decode images
+    @cached_property
+    def image(self):
+        # Card art is shared by every card with the same id
+        image_path = f"assets/cards/{self.id}.png"
+        return load_image(image_path, (150, 200), placeholder_color=self.get_rarity_color())
+
+    @cached_property
+    def animation(self):
+        animation_path = f"assets/effects/{self.element}.png"
+        return load_image(animation_path, (50, 50))
 
     def load_assets(self):
-        # Load card image
-        try:
-            image_path = f"assets/cards/{self.id}.png"
-            self.image = Image.open(image_path)
-            self.image = self.image.resize((150, 200))
-            self.image = ctk.CTkImage(self.image, size=(150, 200))
-        except FileNotFoundError:
-            # Create a colorful placeholder if image not found
-            self.image = ctk.CTkImage(Image.new('RGB', (150, 200), color=self.get_rarity_color()), size=(150, 200))
-            
-        # Load animation if exists
-        try:
-            animation_path = f"assets/effects/{self.element}.png"
-            self.animation = Image.open(animation_path)
-            self.animation = self.animation.resize((50, 50))
-            self.animation = ctk.CTkImage(self.animation, size=(50, 50))
-        except FileNotFoundError:
-            self.animation = None
-            
-        # Load sound effect
-        try:
-            sound_path = f"assets/sounds/card_play.mp3"
-            self.sound = pygame.mixer.Sound(sound_path)
-        except:
-            self.sound = None
+        # Resolve every lazy asset up front, e.g. before a screen is shown
+        for name in ("image", "animation"):
+            getattr(self, name)
 
     def get_rarity_color(self):
         colors = {
@@ -88,8 +144,8 @@ class Card:
         return colors.get(self.element, "#FFFFFF")
         
     def play_sound(self):
-        if self.sound:
-            self.sound.play()
+        # Every card shares the same decoded sound in the bank
+        sound_bank.play("card_play")
 
     def upgrade(self):
         if self.experience >= self.level * 100:
@@ -100,6 +156,26 @@ class Card:
             return True
         return False
 
+class CardInstance:
+    """Mutable battle-time state of a card, pointing at its shared definition."""
+    __slots__ = ("definition", "attack", "defense", "cost", "level", "effects", "cooldown")
+
+    def __init__(self, definition, attack=None, defense=None, cost=None, level=1):
+        self.definition = definition
+        self.attack = definition.attack if attack is None else attack
+        self.defense = definition.defense if defense is None else defense
+        self.cost = definition.cost if cost is None else cost
+        self.level = level
+        self.effects = []  # List of active effects on the card
+        self.cooldown = 0  # Cooldown for special abilities
+
+    id = property(lambda self: self.definition.id)
+    name = property(lambda self: self.definition.name)
+    rarity = property(lambda self: self.definition.rarity)
+    type = property(lambda self: self.definition.type)
+    special_ability = property(lambda self: self.definition.special_ability)
+    element = property(lambda self: self.definition.element)
+
     def use_special_ability(self, target=None):
         if self.special_ability and self.cooldown <= 0:
             ability_data = self.special_ability
@@ -156,12 +232,30 @@ class Card:
             self.cooldown -= 1
 
         # Process other effects
+        self._tick_effects()
+
+    def process_effects(self):
+        """Apply active effects at the start of the card's turn, then age them.
+
+        A buff adds its value to defense and a debuff subtracts it, once per turn
+        while the effect lasts. (Battle always called this, but Card never defined it.)
+        """
+        for effect in self.effects:
+            if effect.effect_type == "buff":
+                self.defense += effect.value
+            elif effect.effect_type == "debuff":
+                self.defense -= effect.value
+        self._tick_effects()
+
+    def _tick_effects(self):
         for effect in self.effects[:]:
             effect.duration -= 1
             if effect.duration <= 0:
                 self.remove_effect(effect)
 
 class CardEffect:
+    __slots__ = ("name", "duration", "effect_type", "value")
+
     def __init__(self, name, duration, effect_type, value):
         self.name = name
         self.duration = duration
@@ -169,75 +263,43 @@ class CardEffect:
         self.value = value
 
 class CardManager:
-    def __init__(self):
+    def __init__(self, seed=None, rng=None):
+        self.rng, self.seed = resolve_rng(seed, rng)
+        self.definitions = {}  # Shared, immutable CardDefinition per card id
         self.cards = {}
+        # Secondary indexes over self.cards, rebuilt by reindex() when the catalog changes
+        self.all_cards = ()
+        self.cards_by_rarity = {}
+        self.cards_by_type = {}
+        self.cards_by_cost = ()
+        self.costs = []
         self.load_cards()
 
     def load_cards(self):
+        # Imported here: the catalog itself builds on the classes in this module
+        from game.catalog import card_catalog
         try:
-            with open("data/cards.json", "r") as f:
-                cards_data = json.load(f)
-                for card_data in cards_data:
-                    card = Card(
-                        id=card_data["id"],
-                        name=card_data["name"],
-                        rarity=CardRarity(card_data["rarity"]),
-                        type=CardType(card_data["type"]),
-                        attack=card_data["attack"],
-                        defense=card_data["defense"],
-                        cost=card_data["cost"],
-                        description=card_data["description"],
-                        special_ability=self._create_special_ability(card_data.get("special_ability"))
-                    )
-                    card.load_image()
-                    self.cards[card.id] = card
+            definitions = card_catalog.definitions("data/cards.json")
         except FileNotFoundError:
             self._create_default_cards()
+            return
+        for definition in definitions:
+            self.definitions[definition.id] = definition
+            self.cards[definition.id] = Card.from_definition(definition)
+        self.reindex()
 
-    def _create_special_ability(self, ability_data):
-        if not ability_data:
-            return None
-            
-        def ability(card, target):
-            if ability_data["type"] == "heal":
-                # Heal target card or player
-                if target:
-                    target.defense = min(target.defense + ability_data["value"], target.defense * 2)
-                    return f"Healed {ability_data['value']} health"
-                return None
-                
-            elif ability_data["type"] == "buff":
-                # Add buff effect to target
-                effect = CardEffect(
-                    name=ability_data["name"],
-                    duration=ability_data["duration"],
-                    effect_type="buff",
-                    value=ability_data["value"]
-                )
-                target.add_effect(effect)
-                return f"Applied {ability_data['name']} buff"
-                
-            elif ability_data["type"] == "debuff":
-                # Add debuff effect to target
-                effect = CardEffect(
-                    name=ability_data["name"],
-                    duration=ability_data["duration"],
-                    effect_type="debuff",
-                    value=ability_data["value"]
-                )
-                target.add_effect(effect)
-                return f"Applied {ability_data['name']} debuff"
-                
-            elif ability_data["type"] == "damage":
-                # Deal damage to target
-                if target:
-                    target.defense -= ability_data["value"]
-                    return f"Dealt {ability_data['value']} damage"
-                return None
-                
-            return None
-            
-        return ability
+    def reindex(self):
+        # Call after changing self.cards; lookups below only read these tuples
+        self.all_cards = tuple(self.cards.values())
+        by_rarity = {}
+        by_type = {}
+        for card in self.all_cards:
+            by_rarity.setdefault(card.rarity, []).append(card)
+            by_type.setdefault(card.type, []).append(card)
+        self.cards_by_rarity = {rarity: tuple(cards) for rarity, cards in by_rarity.items()}
+        self.cards_by_type = {card_type: tuple(cards) for card_type, cards in by_type.items()}
+        self.cards_by_cost = tuple(sorted(self.all_cards, key=lambda card: card.cost))
+        self.costs = [card.cost for card in self.cards_by_cost]
 
     def _create_default_cards(self):
         default_cards = [
@@ -331,27 +393,35 @@ class CardManager:
             }
         ]
         
+        os.makedirs("data", exist_ok=True)
         with open("data/cards.json", "w") as f:
             json.dump(default_cards, f, indent=4)
             
         self.load_cards()
 
-    def get_random_card(self, rarity=None):
+    def get_random_card(self, rarity=None, rng=None):
         if rarity:
-            available_cards = [card for card in self.cards.values() if card.rarity == rarity]
+            available_cards = self.cards_by_rarity.get(rarity, ())
         else:
-            available_cards = list(self.cards.values())
+            available_cards = self.all_cards
             
         if not available_cards:
             return None
             
-        return random.choice(available_cards)
+        return (rng or self.rng).choice(available_cards)
 
     def get_card_by_id(self, card_id):
         return self.cards.get(card_id)
 
+    def get_definition(self, card_id):
+        return self.definitions.get(card_id)
+
     def get_cards_by_rarity(self, rarity):
-        return [card for card in self.cards.values() if card.rarity == rarity]
+        return self.cards_by_rarity.get(rarity, ())
 
     def get_cards_by_type(self, card_type):
-        return [card for card in self.cards.values() if card.type == card_type]
+        return self.cards_by_type.get(card_type, ())
+
+    def get_cards_by_max_cost(self, mana):
+        """Cards costing at most mana, cheapest first."""
+        return self.cards_by_cost[:bisect_right(self.costs, mana)]
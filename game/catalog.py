@@ -0,0 +1,163 @@
+"""
+Shared card catalog.
+
+Card definition files (data/cards.json, data/initial_deck.json) are parsed
+once, validated, and compiled into shared CardDefinition objects. The compiled
+result is cached per path and reused until the file's mtime/size change and
+its content hash differs, so creating a player or a CardManager does not parse
+JSON again.
+"""
+import hashlib
+import json
+import os
+import threading
+
+from game.cards import CardDefinition, CardRarity, CardType
+
+# field -> (accepted types, required)
+CARD_SCHEMA = {
+    "id": ((str, int), True),
+    "name": ((str,), True),
+    "rarity": ((str,), True),
+    "type": ((str,), True),
+    "attack": ((int,), True),
+    "defense": ((int,), True),
+    "cost": ((int,), True),
+    "description": ((str,), True),
+    "special_ability": ((dict, type(None)), False),
+    "element": ((str, type(None)), False)
+}
+
+# special_ability "type" -> fields CardInstance.use_special_ability reads, with their types
+ABILITY_SCHEMA = {
+    "heal": {"value": (int,)},
+    "damage": {"value": (int,)},
+    "buff": {"name": (str,), "duration": (int,), "value": (int,)},
+    "debuff": {"name": (str,), "duration": (int,), "value": (int,)}
+}
+
+RARITIES = {rarity.value for rarity in CardRarity}
+CARD_TYPES = {card_type.value for card_type in CardType}
+
+
+class CatalogError(ValueError):
+    pass
+
+
+def validate_card(card_data, where):
+    if not isinstance(card_data, dict):
+        raise CatalogError(f"{where}: card must be an object")
+    for field, (types, required) in CARD_SCHEMA.items():
+        if field not in card_data:
+            if required:
+                raise CatalogError(f"{where}: missing field '{field}'")
+            continue
+        value = card_data[field]
+        # bool is an int subclass but never a valid stat
+        if not isinstance(value, types) or isinstance(value, bool):
+            raise CatalogError(f"{where}: field '{field}' has invalid type {type(value).__name__}")
+    if card_data["rarity"] not in RARITIES:
+        raise CatalogError(f"{where}: unknown rarity '{card_data['rarity']}'")
+    if card_data["type"] not in CARD_TYPES:
+        raise CatalogError(f"{where}: unknown type '{card_data['type']}'")
+    ability = card_data.get("special_ability")
+    if ability:
+        validate_ability(ability, f"{where}.special_ability")
+
+
+def validate_ability(ability, where):
+    fields = ABILITY_SCHEMA.get(ability.get("type"))
+    if fields is None:
+        raise CatalogError(f"{where}: unknown type {ability.get('type')!r}")
+    for field, types in fields.items():
+        if field not in ability:
+            raise CatalogError(f"{where}: missing field '{field}'")
+        value = ability[field]
+        if not isinstance(value, types) or isinstance(value, bool):
+            raise CatalogError(f"{where}: field '{field}' has invalid type {type(value).__name__}")
+    if "duration" in fields and ability["duration"] < 1:
+        raise CatalogError(f"{where}: duration must be at least 1")
+
+
+def compile_card(card_data):
+    return CardDefinition(
+        id=card_data["id"],
+        name=card_data["name"],
+        rarity=CardRarity(card_data["rarity"]),
+        type=CardType(card_data["type"]),
+        attack=card_data["attack"],
+        defense=card_data["defense"],
+        cost=card_data["cost"],
+        description=card_data["description"],
+        special_ability=card_data.get("special_ability") or None,
+        element=card_data.get("element")
+    )
+
+
+class CardCatalog:
+    def __init__(self):
+        self._compiled = {}  # path -> (stat key, content hash, definitions)
+        self._indexes = {}  # path -> (definitions, {id: definition})
+        self._lock = threading.Lock()
+
+    def definitions(self, path):
+        """Compiled definitions of a card file as a tuple, in file order.
+
+        Accepts either a list of cards or an object with a "cards" list.
+        Raises FileNotFoundError if the file is missing and CatalogError if it
+        does not match CARD_SCHEMA.
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        stat_key = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._compiled.get(path)
+            if cached is not None and cached[0] == stat_key:
+                return cached[2]
+
+        with open(path, "rb") as f:
+            content = f.read()
+        digest = hashlib.sha256(content).hexdigest()
+        with self._lock:
+            cached = self._compiled.get(path)
+            if cached is not None and cached[1] == digest:
+                # Touched but unchanged
+                self._compiled[path] = (stat_key, digest, cached[2])
+                return cached[2]
+
+        data = json.loads(content)
+        cards = data["cards"] if isinstance(data, dict) else data
+        if not isinstance(cards, list):
+            raise CatalogError(f"{path}: expected a list of cards")
+        for index, card_data in enumerate(cards):
+            validate_card(card_data, f"{path}[{index}]")
+        definitions = tuple(compile_card(card_data) for card_data in cards)
+
+        with self._lock:
+            self._compiled[path] = (stat_key, digest, definitions)
+        return definitions
+
+    def by_id(self, path):
+        """id -> definition for a card file, rebuilt only when its definitions are."""
+        definitions = self.definitions(path)
+        path = os.path.abspath(path)
+        with self._lock:
+            cached = self._indexes.get(path)
+            if cached is not None and cached[0] is definitions:
+                return cached[1]
+            index = {definition.id: definition for definition in definitions}
+            self._indexes[path] = (definitions, index)
+            return index
+
+    def invalidate(self, path=None):
+        with self._lock:
+            if path is None:
+                self._compiled.clear()
+                self._indexes.clear()
+            else:
+                self._compiled.pop(os.path.abspath(path), None)
+                self._indexes.pop(os.path.abspath(path), None)
+
+
+# One catalog per process
+card_catalog = CardCatalog()
@@ -0,0 +1,154 @@
+"""
+Chest drop tables.
+
+Each chest type has rarity weights, a number of cards, optional guaranteed
+slots and optional pity thresholds. Weighted draws use Walker/Vose alias
+tables built once per table, so every card costs O(1) regardless of the
+number of rarities or cards in the catalog.
+"""
+from game.cards import Card, CardRarity
+from game.rng import resolve_rng
+
+# Lowest to highest
+RARITY_ORDER = (CardRarity.COMMON, CardRarity.RARE, CardRarity.EPIC, CardRarity.LEGENDARY)
+
+
+class AliasTable:
+    """Vose's alias method: O(n) to build, O(1) per weighted draw."""
+
+    def __init__(self, outcomes, weights):
+        if not outcomes or sum(weights) <= 0:
+            raise ValueError("an alias table needs at least one positive weight")
+        n = len(outcomes)
+        total = sum(weights)
+        scaled = [weight * n / total for weight in weights]
+        self.outcomes = tuple(outcomes)
+        self.probability = [1.0] * n
+        self.alias = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            low = small.pop()
+            high = large.pop()
+            self.probability[low] = scaled[low]
+            self.alias[low] = high
+            scaled[high] -= 1.0 - scaled[low]
+            (small if scaled[high] < 1.0 else large).append(high)
+        # Whatever is left is 1.0 up to rounding
+        for i in small + large:
+            self.probability[i] = 1.0
+
+    def sample(self, rng):
+        i = rng.randrange(len(self.outcomes))
+        return self.outcomes[i if rng.random() < self.probability[i] else self.alias[i]]
+
+
+class DropTable:
+    """What one chest type contains.
+
+    weights maps CardRarity -> relative weight. guaranteed maps a minimum rarity
+    to how many of the chest's cards are at least that rare. pity maps a rarity
+    to N: after N - 1 cards in a row from this table without that rarity (or
+    better), the next card is forced to it. Pity counters live in a dict owned
+    by the caller, usually Player.pity.
+    """
+
+    def __init__(self, name, weights, cards=1, guaranteed=None, pity=None):
+        self.name = name
+        self.cards = cards
+        self.guaranteed = dict(guaranteed or {})
+        self.pity = dict(pity or {})
+        if sum(self.guaranteed.values()) > cards:
+            raise ValueError(f"{name}: more guaranteed slots than cards")
+        # One alias table per minimum rarity, for guaranteed slots and pity
+        self.tables = {}
+        for minimum in RARITY_ORDER:
+            eligible = [rarity for rarity in RARITY_ORDER
+                        if _rank(rarity) >= _rank(minimum) and weights.get(rarity, 0) > 0]
+            if eligible:
+                self.tables[minimum] = AliasTable(eligible, [weights[rarity] for rarity in eligible])
+
+    def draw_rarities(self, rng, pity=None):
+        """Rarities for one chest, updating the pity counters in pity (a dict) if given."""
+        counters = pity.setdefault(self.name, {}) if pity is not None else {}
+        slots = [minimum for minimum, count in self.guaranteed.items() for _ in range(count)]
+        slots += [RARITY_ORDER[0]] * (self.cards - len(slots))
+
+        rarities = []
+        for minimum in slots:
+            for rarity, threshold in self.pity.items():
+                if counters.get(rarity.value, 0) >= threshold - 1 and _rank(rarity) > _rank(minimum):
+                    minimum = rarity
+            rarity = self._table(minimum).sample(rng)
+            for pity_rarity in self.pity:
+                if _rank(rarity) >= _rank(pity_rarity):
+                    counters[pity_rarity.value] = 0
+                else:
+                    counters[pity_rarity.value] = counters.get(pity_rarity.value, 0) + 1
+            rarities.append(rarity)
+        return rarities
+
+    def _table(self, minimum):
+        table = self.tables.get(minimum)
+        if table is None:
+            # Nothing this rare has weight here; fall back to exactly that rarity
+            table = self.tables[minimum] = AliasTable([minimum], [1])
+        return table
+
+
+def _rank(rarity):
+    return RARITY_ORDER.index(rarity)
+
+
+DROP_TABLES = {
+    "Common": DropTable("Common", {CardRarity.COMMON: 80, CardRarity.RARE: 17, CardRarity.EPIC: 2.5,
+                                   CardRarity.LEGENDARY: 0.5}, cards=3, pity={CardRarity.EPIC: 20}),
+    "Rare": DropTable("Rare", {CardRarity.COMMON: 50, CardRarity.RARE: 40, CardRarity.EPIC: 8,
+                               CardRarity.LEGENDARY: 2}, cards=2, guaranteed={CardRarity.RARE: 1},
+                      pity={CardRarity.LEGENDARY: 60}),
+    "Epic": DropTable("Epic", {CardRarity.EPIC: 90, CardRarity.LEGENDARY: 10}, cards=1,
+                      pity={CardRarity.LEGENDARY: 15}),
+    "Legendary": DropTable("Legendary", {CardRarity.LEGENDARY: 1}, cards=1)
+}
+
+# Chest names sold in the UI's chest shop
+CHEST_TABLES = {
+    "Wooden Chest": "Common",
+    "Silver Chest": "Rare",
+    "Golden Chest": "Epic",
+    "Magic Chest": "Legendary"
+}
+
+
+class DropEngine:
+    """Opens chests into cards drawn from a CardManager's catalog."""
+
+    def __init__(self, card_manager, tables=None, seed=None, rng=None):
+        self.card_manager = card_manager
+        self.tables = dict(DROP_TABLES if tables is None else tables)
+        self.rng, self.seed = resolve_rng(seed, rng)
+
+    def table(self, chest_type):
+        return self.tables[CHEST_TABLES.get(chest_type, chest_type)]
+
+    def open(self, chest_type, rng=None, pity=None):
+        """Draw the cards of one chest; each is a fresh collection Card."""
+        rng = rng or self.rng
+        return [self._draw_card(rarity, rng) for rarity in self.table(chest_type).draw_rarities(rng, pity)]
+
+    def open_many(self, chest_type, n, rng=None, pity=None):
+        """Open n chests of one type; returns a list of n card lists."""
+        table = self.table(chest_type)
+        rng = rng or self.rng
+        return [[self._draw_card(rarity, rng) for rarity in table.draw_rarities(rng, pity)] for _ in range(n)]
+
+    def _draw_card(self, rarity, rng):
+        # Uniform within a rarity, straight from the CardManager index; if the
+        # catalog has no card that rare, the closest rarity below it is used
+        for candidate in reversed(RARITY_ORDER[:_rank(rarity) + 1]):
+            pool = self.card_manager.get_cards_by_rarity(candidate)
+            if pool:
+                card = pool[rng.randrange(len(pool))]
+                return Card.from_definition(card.definition)
+        raise ValueError(f"no card of rarity {rarity.value} or lower in the catalog")
@@ -1,32 +1,28 @@
-import pygame
 import json
 import os
-from datetime import datetime
-import random
-from PIL import Image, ImageTk
-import customtkinter as ctk
+from datetime import datetime, time, timedelta
+from functools import cached_property
+from game.audio import sound_bank
+from game.player import ECONOMY_SOUNDS, Player
+from game.rng import resolve_rng
+from game.scheduler import Scheduler
+from game.shop import Shop
+from game.storage import PlayerRegistry, PlayerStore
+
+OFFER_ROTATION_INTERVAL = 24 * 60 * 60  # seconds
 
 class Game:
-    def __init__(self):
+    def __init__(self, rng=None, store=None, player_cache_size=1000, scheduler=None):
         self.players = {}
+        self.store = store
+        self.scheduler = scheduler
+        self.player_cache_size = player_cache_size
+        self.rng = rng  # Seeds for battles are drawn from here when not given
+        self.last_battle_seed = None
         
-        # Initialize pygame mixer
-        try:
-            pygame.mixer.init()
-        except pygame.error:
-            print("Warning: Sound system initialization failed. Game will run without sound.")
-            
-        # Initialize empty sounds dictionary
-        self.sounds = {}
-        
-        # Create necessary directories if they don't exist
-        os.makedirs("data", exist_ok=True)
-        os.makedirs("assets/sounds", exist_ok=True)
-        os.makedirs("assets/cards", exist_ok=True)
-        os.makedirs("assets/avatars", exist_ok=True)
-        
-        # Try to load sounds, but continue if they don't exist
-        sound_files = {
+        # Sound names and files; decoding happens in the background sound bank,
+        # and headless games without an audio backend (see ui.adapter) stay silent
+        self.sounds = {
             "battle": "assets/sounds/battle.mp3",
             "victory": "assets/sounds/victory.mp3",
             "defeat": "assets/sounds/defeat.mp3",
@@ -36,53 +32,138 @@ class Game:
             "chest_open": "assets/sounds/chest_open.mp3"
         }
         
-        for sound_name, sound_path in sound_files.items():
-            try:
-                self.sounds[sound_name] = pygame.mixer.Sound(sound_path)
-            except (FileNotFoundError, pygame.error):
-                print(f"Warning: Sound file {sound_path} not found or could not be loaded.")
-                
-        if not self.sounds:
-            print("No sound files were loaded. Game will run without sound.")
-            print("Sound files should be placed in assets/sounds/ directory.")
+        # Create necessary directories if they don't exist
+        os.makedirs("data", exist_ok=True)
+        os.makedirs("assets/sounds", exist_ok=True)
+        os.makedirs("assets/cards", exist_ok=True)
+        os.makedirs("assets/avatars", exist_ok=True)
+        
+        for sound_name, sound_path in self.sounds.items():
+            sound_bank.register(sound_name, sound_path)
+        sound_bank.preload(list(self.sounds) + list(ECONOMY_SOUNDS))
             
         self.load_game_data()
+        self.setup_scheduler()
         
     def safe_play_sound(self, sound_name):
-        """Safely play a sound if it exists in the sounds dictionary."""
-        if sound_name in self.sounds:
-            try:
-                self.sounds[sound_name].play()
-            except pygame.error:
-                pass  # Ignore sound playing errors
+        """Play a sound without blocking; missing files and playback errors are ignored."""
+        sound_bank.play(sound_name)
                 
     def load_game_data(self):
-        try:
-            with open("data/game_data.json", "r") as f:
-                data = json.load(f)
-                self.players = {username: Player(username) for username in data.get("players", [])}
-                for player in self.players.values():
-                    player.load_avatar()
-        except FileNotFoundError:
-            self.players = {}
+        if self.store is None:
+            self.store = PlayerStore("data/players.db")
+        self._migrate_legacy_players()
+        # Players are hydrated from the store on first access, not at startup
+        self.players = PlayerRegistry(self.store, self.player_cache_size)
             
     def save_game_data(self):
-        data = {
-            "players": list(self.players.keys()),
-            "last_save": datetime.now().isoformat()
-        }
-        with open("data/game_data.json", "w") as f:
-            json.dump(data, f)
+        # Only in-memory players with changed fields are written, in one transaction
+        saved = self.players.flush()
+        self.scheduler.save()
+        return saved
+
+    @cached_property
+    def shop(self):
+        return Shop(rng=self.rng)
+
+    def setup_scheduler(self):
+        # Timers left pending by the last run are loaded from data/schedule.json
+        # and the overdue ones fire on the first tick()
+        if self.scheduler is None:
+            self.scheduler = Scheduler("data/schedule.json")
+        self.scheduler.register("chest_unlock", self._unlock_chest)
+        self.scheduler.register("reward", self._grant_reward)
+        self.scheduler.register("offer_rotation", lambda payload, due: self.shop.update_offers())
+        if "offers:daily" not in self.scheduler:
+            midnight = datetime.combine(datetime.now().date() + timedelta(days=1), time())
+            self.scheduler.schedule("offer_rotation", midnight, key="offers:daily",
+                                    interval=OFFER_ROTATION_INTERVAL)
+
+    def tick(self, now=None):
+        """Fire every timer that came due; returns how many fired."""
+        fired = self.scheduler.run_due(now)
+        if fired:
+            self.save_game_data()
+        return fired
+
+    def add_chest(self, username, chest_type, unlock_time):
+        """Give a player a chest and schedule its unlock; returns the chest."""
+        chest = self.players[username].add_chest(chest_type, unlock_time)
+        self._schedule_unlock(username, chest)
+        return chest
+
+    def purchase_item(self, username, item_id):
+        """Shop.purchase_item for a player, scheduling the unlock of any chest it gives."""
+        player = self.players[username]
+        before = len(player.chests)
+        result = self.shop.purchase_item(player, item_id)
+        for chest in player.chests[before:]:
+            self._schedule_unlock(username, chest)
+        return result
+
+    def open_chest(self, username, index, drops, rng=None):
+        """Player.open_chest, dropping the chest's pending unlock timer."""
+        player = self.players[username]
+        chest = player.chests[index]
+        cards = player.open_chest(index, drops, rng=rng)
+        if cards is not None:
+            self.scheduler.cancel(self._unlock_key(username, chest))
+        return cards
+
+    def grant_reward(self, username, due, gold=0, gems=0, trophies=0):
+        """Give a player gold, gems and trophies at due (a datetime)."""
+        return self.scheduler.schedule("reward", due, {
+            "username": username,
+            "gold": gold,
+            "gems": gems,
+            "trophies": trophies
+        })
+
+    def _unlock_key(self, username, chest):
+        return f"chest:{username}:{chest['id']}"
+
+    def _schedule_unlock(self, username, chest):
+        self.scheduler.schedule("chest_unlock", chest["unlock_time"],
+                                {"username": username, "chest_id": chest["id"]},
+                                key=self._unlock_key(username, chest))
+
+    def _unlock_chest(self, payload, due):
+        if payload["username"] not in self.players:
+            return
+        player = self.players[payload["username"]]
+        for chest in player.chests:
+            if chest.get("id") == payload["chest_id"]:
+                chest["unlocked"] = True
+                player.mark_dirty("chests")
+                break
+
+    def _grant_reward(self, payload, due):
+        if payload["username"] not in self.players:
+            return
+        player = self.players[payload["username"]]
+        if payload["gold"]:
+            player.earn_gold(payload["gold"])
+        if payload["gems"]:
+            player.earn_gems(payload["gems"])
+        if payload["trophies"]:
+            player.earn_trophies(payload["trophies"])
+
+    def _migrate_legacy_players(self):
+        # data/game_data.json used to hold just the list of usernames
+        if len(self.store) or not os.path.exists("data/game_data.json"):
+            return
+        with open("data/game_data.json", "r") as f:
+            data = json.load(f)
+        self.store.save(Player(username) for username in data.get("players", []))
+        os.replace("data/game_data.json", "data/game_data.json.migrated")
             
     def add_player(self, username):
         if username not in self.players:
             self.players[username] = Player(username)
-            self.players[username].load_avatar()
-            self.save_game_data()
             return True
         return False
         
-    def battle(self, player1, player2):
+    def battle(self, player1, player2, seed=None):
         if player1 not in self.players or player2 not in self.players:
             return None
             
@@ -110,8 +191,9 @@ class Game:
                 p2_score += 2  # Bonus for special abilities
                 
         # Add some randomness to make battles more exciting
-        p1_score += random.randint(-2, 2)
-        p2_score += random.randint(-2, 2)
+        rng, self.last_battle_seed = resolve_rng(seed, self.rng)
+        p1_score += rng.randint(-2, 2)
+        p2_score += rng.randint(-2, 2)
         
         winner = player1 if p1_score > p2_score else player2
         loser = player2 if winner == player1 else player1
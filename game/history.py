@@ -0,0 +1,323 @@
+"""
+Append-only battle history.
+
+Battles are appended as JSON lines to numbered segment files under a history
+directory. A small index file lists the closed segments and their record
+counts, so opening the store reads the index and the active segment only.
+Segments rotate once they hold segment_size records, and compact() merges
+closed segments and can drop old records. Every record has a sequence number
+(how many records were appended before it) that compaction never changes; the
+index stores the sequence number of the first record still kept.
+
+PlayerStatsIndex keeps running per-player aggregates next to the segments so
+stats lookups never scan the history.
+"""
+import atexit
+import heapq
+import json
+import os
+import time
+import weakref
+from collections import deque
+
+INDEX_FILE = "index.json"
+STATS_FILE = "stats.json"
+
+# Stores and stats indexes still open at exit; weak, so they can be collected before then
+_open = weakref.WeakSet()
+
+
+@atexit.register
+def _close_all():
+    for item in list(_open):
+        item.close()
+
+
+def _write_json_atomic(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class BattleHistoryStore:
+    def __init__(self, directory="data/battle_history", segment_size=10000, fsync_every=32, fsync_interval=1.0):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.segments = []  # Closed segments: {"name": ..., "count": ...}
+        self.base = 0  # Sequence number of the first kept record
+        self.active_name = None
+        self.active_count = 0
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+        self._migrate_legacy()
+        _open.add(self)
+
+    def __len__(self):
+        return sum(segment["count"] for segment in self.segments) + self.active_count
+
+    def __iter__(self):
+        for name in self._segment_names():
+            yield from self._read_segment(name)
+
+    @property
+    def end(self):
+        """Sequence number the next appended record will get."""
+        return self.base + len(self)
+
+    def iter_from(self, seq):
+        """Iterate records from sequence number seq on, skipping whole segments by count.
+
+        Starts at the first kept record if seq was compacted away.
+        """
+        position = max(0, seq - self.base)
+        counts = [segment["count"] for segment in self.segments] + [self.active_count]
+        for name, count in zip(self._segment_names(), counts):
+            if position >= count:
+                position -= count
+                continue
+            for offset, record in enumerate(self._read_segment(name)):
+                if offset >= position:
+                    yield record
+            position = 0
+
+    def append(self, record):
+        if self._file is None:
+            self._file = open(self._path(self.active_name), "a")
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        self.active_count += 1
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+        if self.active_count >= self.segment_size:
+            self.rotate()
+
+    def sync(self):
+        """Force appended records to disk."""
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def rotate(self):
+        """Close the active segment and start a new one."""
+        if not self.active_count:
+            return
+        self.sync()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.segments.append({"name": self.active_name, "count": self.active_count})
+        self.active_name = self._segment_name(self._next_number())
+        self.active_count = 0
+        self._save_index()
+
+    def compact(self, keep_last=None):
+        """Merge closed segments into full-size segments, keeping only the last keep_last records overall."""
+        self.rotate()
+        records = [record for name in self._segment_names() for record in self._read_segment(name)]
+        if keep_last is not None:
+            kept = records[-keep_last:] if keep_last else []
+            self.base += len(records) - len(kept)
+            records = kept
+
+        old_names = [segment["name"] for segment in self.segments]
+        number = self._next_number()
+        segments = []
+        for start in range(0, len(records), self.segment_size):
+            chunk = records[start:start + self.segment_size]
+            name = self._segment_name(number)
+            number += 1
+            path = self._path(name)
+            with open(f"{path}.tmp", "w") as f:
+                f.writelines(json.dumps(record) + "\n" for record in chunk)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(f"{path}.tmp", path)
+            segments.append({"name": name, "count": len(chunk)})
+
+        # The index switches to the new segments before the old files go away
+        self.segments = segments
+        self.active_name = self._segment_name(number)
+        self._save_index()
+        for name in old_names:
+            try:
+                os.remove(self._path(name))
+            except FileNotFoundError:
+                pass
+
+    def close(self):
+        self.sync()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._save_index()
+
+    def _load_index(self):
+        try:
+            with open(self._path(INDEX_FILE), "r") as f:
+                index = json.load(f)
+            self.segments = index.get("segments", [])
+            self.active_name = index.get("active")
+            self.base = index.get("base", 0)
+        except FileNotFoundError:
+            self.segments = []
+            self.active_name = None
+            self.base = 0
+        if self.active_name is None:
+            self.active_name = self._segment_name(self._next_number())
+        # The active segment may have grown since the index was last written
+        self.active_count = sum(1 for _ in self._read_segment(self.active_name))
+
+    def _save_index(self):
+        _write_json_atomic(self._path(INDEX_FILE), {"segments": self.segments, "active": self.active_name,
+                                                       "base": self.base})
+
+    def _migrate_legacy(self):
+        # One-time import of the old single-file history (data/battle_history.json)
+        legacy_path = f"{os.path.normpath(self.directory)}.json"
+        if len(self) or not os.path.exists(legacy_path):
+            return
+        with open(legacy_path, "r") as f:
+            for record in json.load(f):
+                self.append(record)
+        self.sync()
+        os.replace(legacy_path, f"{legacy_path}.migrated")
+
+    def _segment_names(self):
+        return [segment["name"] for segment in self.segments] + [self.active_name]
+
+    def _read_segment(self, name):
+        try:
+            with open(self._path(name), "r") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn final line from an interrupted write
+                        return
+        except FileNotFoundError:
+            return
+
+    def _next_number(self):
+        names = [segment["name"] for segment in self.segments]
+        if self.active_name:
+            names.append(self.active_name)
+        numbers = [int(name.split("-")[1].split(".")[0]) for name in names]
+        return max(numbers, default=0) + 1
+
+    def _segment_name(self, number):
+        return f"segment-{number:06d}.jsonl"
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+
+class PlayerStatsIndex:
+    """Running per-player battle aggregates, updated as each battle is recorded.
+
+    Persisted to stats.json in the history directory together with the sequence
+    number of the next record it has not folded in; on load, any records from
+    that point on are replayed, and the index is rebuilt from the history if it
+    is missing or ahead. Compact the history through compact() here so no
+    record is dropped before it is counted.
+    """
+
+    def __init__(self, history, recent_size=20, save_every=100):
+        self.history = history
+        self.recent_size = recent_size
+        self.save_every = save_every
+        self.path = os.path.join(history.directory, STATS_FILE)
+        self.players = {}
+        self.seq = 0
+        self._unsaved = 0
+        self.load()
+        _open.add(self)
+
+    def record(self, battle):
+        """Fold one history record into the aggregates."""
+        for username, opponent_health in ((battle["player1"], battle["player2_health"]),
+                                          (battle["player2"], battle["player1_health"])):
+            stats = self.players.get(username)
+            if stats is None:
+                stats = self.players[username] = {
+                    "battles": 0,
+                    "wins": 0,
+                    "turns": 0,
+                    "damage": 0,
+                    "recent": deque(maxlen=self.recent_size)
+                }
+            stats["battles"] += 1
+            stats["wins"] += battle["winner"] == username
+            stats["turns"] += battle["turns"]
+            stats["damage"] += opponent_health
+            stats["recent"].append(battle)
+        self.seq += 1
+        self._unsaved += 1
+        if self._unsaved >= self.save_every:
+            self.save()
+
+    def get(self, username):
+        return self.players.get(username)
+
+    def recent(self, username):
+        stats = self.players.get(username)
+        return list(stats["recent"]) if stats else []
+
+    def top(self, limit=10, key="wins"):
+        return heapq.nlargest(limit, self.players, key=lambda username: self.players[username][key])
+
+    def compact(self, keep_last=None):
+        """Compact the history, after folding in and saving every record it still has."""
+        for battle in self.history.iter_from(self.seq):
+            self.record(battle)
+        self.save()
+        self.history.compact(keep_last)
+
+    def close(self):
+        self.save()
+
+    def rebuild(self):
+        self.players = {}
+        self.seq = self.history.base
+        for battle in self.history:
+            self.record(battle)
+        self.save()
+
+    def load(self):
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.rebuild()
+            return
+        seq = data["seq"]
+        if seq > self.history.end or data.get("recent_size") != self.recent_size:
+            self.rebuild()
+            return
+        if seq < self.history.base:
+            print(f"Battle stats miss records {seq} to {self.history.base - 1}, compacted before they were counted")
+            seq = self.history.base
+        self.seq = seq
+        self.players = {}
+        for username, stats in data["players"].items():
+            stats["recent"] = deque(stats["recent"], maxlen=self.recent_size)
+            self.players[username] = stats
+        # Catch up with battles recorded after the last save
+        for battle in self.history.iter_from(self.seq):
+            self.record(battle)
+
+    def save(self):
+        players = {username: dict(stats, recent=list(stats["recent"])) for username, stats in self.players.items()}
+        _write_json_atomic(self.path, {"seq": self.seq, "recent_size": self.recent_size, "players": players})
+        self._unsaved = 0
@@ -1,92 +1,70 @@
 import customtkinter as ctk
-import json
 import os
-from PIL import Image, ImageTk
+import sys
+from pathlib import Path
 from datetime import datetime
+from functools import cached_property
+import queue
 import random
-import pygame
-import time
-from player import Player
-from cards import Card, CardRarity, CardType
-from battle import BattleManager
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 
-class Game:
-    def __init__(self):
-        self.players = {}
-        
-        # Initialize pygame mixer
-        try:
-            pygame.mixer.init()
-        except pygame.error:
-            print("Warning: Sound system initialization failed. Game will run without sound.")
-        
-        # Initialize empty sounds dictionary
-        self.sounds = {}
-        
-        # Create necessary directories if they don't exist
-        os.makedirs("data", exist_ok=True)
-        os.makedirs("assets/sounds", exist_ok=True)
-        os.makedirs("assets/cards", exist_ok=True)
-        os.makedirs("assets/avatars", exist_ok=True)
-        
-        # Try to load sounds, but continue if they don't exist
-        sound_files = {
-            "battle": "assets/sounds/battle.mp3",
-            "victory": "assets/sounds/victory.mp3",
-            "defeat": "assets/sounds/defeat.mp3",
-            "card_play": "assets/sounds/card_play.mp3",
-            "menu": "assets/sounds/menu.mp3",
-            "shop": "assets/sounds/shop.mp3",
-            "chest_open": "assets/sounds/chest_open.mp3"
-        }
-        
-        for sound_name, sound_path in sound_files.items():
-            try:
-                self.sounds[sound_name] = pygame.mixer.Sound(sound_path)
-            except (FileNotFoundError, pygame.error):
-                print(f"Warning: Sound file {sound_path} not found or could not be loaded.")
-        
-        if not self.sounds:
-            print("No sound files were loaded. Game will run without sound.")
-            print("Sound files should be placed in assets/sounds/ directory.")
-        
-        self.load_game_data()
+# Adiciona o diretório pai ao path para importar o pacote game
+sys.path.append(str(Path(__file__).parent.parent))
+from game.assets import AssetPreloader, load_image
+from game.cards import Card, CardManager
+from game.battle import BattleManager
+from game.game import Game as CoreGame
+from ui.adapter import install as install_ui_adapter
+from ui.virtual_list import VirtualList
 
-    def safe_play_sound(self, sound_name):
-        """Safely play a sound if it exists in the sounds dictionary."""
-        if sound_name in self.sounds:
-            try:
-                self.sounds[sound_name].play()
-            except pygame.error:
-                pass  # Ignore sound playing errors
+AUTOSAVE_INTERVAL_MS = 5000
+PRELOAD_POLL_MS = 50
+BATTLE_POLL_MS = 50
+SCHEDULER_TICK_MS = 1000
+DECK_SIZE = 8
+CARD_ROW_HEIGHT = 215
 
-    def load_game_data(self):
-        try:
-            with open("data/game_data.json", "r") as f:
-                data = json.load(f)
-                self.players = {username: Player(username) for username in data.get("players", [])}
-                for player in self.players.values():
-                    player.load_avatar()
-        except FileNotFoundError:
-            self.players = {}
+ADD_BUTTON_STYLE = {"text": "Add to Deck", "fg_color": "#FFD700", "hover_color": "#FFA500", "text_color": "black"}
+REMOVE_BUTTON_STYLE = {"text": "Remove", "fg_color": "#FF4444", "hover_color": "#FF0000", "text_color": "white"}
+BUY_BUTTON_STYLE = {"text": "Buy", "fg_color": "#FFD700", "hover_color": "#FFA500", "text_color": "black"}
 
-    def save_game_data(self):
-        data = {
-            "players": list(self.players.keys()),
-            "last_save": datetime.now().isoformat()
-        }
-        with open("data/game_data.json", "w") as f:
-            json.dump(data, f)
+BACKGROUND_SIZE = (1200, 800)
+MAIN_MENU_BACKGROUND = "assets/backgrounds/main_menu.png"
+CHEST_IMAGE_SIZE = (200, 200)
 
-    def add_player(self, username):
-        if username not in self.players:
-            self.players[username] = Player(username)
-            self.players[username].load_avatar()
-            self.save_game_data()
-            return True
-        return False
+# Chest types sold in the shop and their prices
+CHESTS = [
+    {"name": "Wooden Chest", "price": 100, "color": "#8B4513", "rarity": "Common"},
+    {"name": "Silver Chest", "price": 250, "color": "#C0C0C0", "rarity": "Rare"},
+    {"name": "Golden Chest", "price": 500, "color": "#FFD700", "rarity": "Epic"},
+    {"name": "Magic Chest", "price": 1000, "color": "#9932CC", "rarity": "Legendary"}
+]
+
+def chest_image_path(chest):
+    return f"assets/chests/{chest['name'].lower().replace(' ', '_')}.png"
 
-    def battle(self, player1, player2):
+def preload_jobs():
+    """Images decoded in the background at launch, as (path, size) pairs."""
+    jobs = [(MAIN_MENU_BACKGROUND, BACKGROUND_SIZE)]
+    jobs += [(f"assets/backgrounds/{name}.png", BACKGROUND_SIZE) for name in ("battle", "deck_builder")]
+    jobs += [(chest_image_path(chest), CHEST_IMAGE_SIZE) for chest in CHESTS]
+    jobs.append(("assets/avatars/default.png", (100, 100)))
+    for directory, size in (("assets/cards", (150, 200)), ("assets/effects", (50, 50))):
+        if os.path.isdir(directory):
+            jobs += [(os.path.join(directory, name), size)
+                     for name in sorted(os.listdir(directory)) if name.endswith(".png")]
+    return jobs
+
+class Game(CoreGame):
+    battle_manager = None
+
+    @cached_property
+    def cards(self):
+        # Catalog sold in the cards shop, loaded on the first visit
+        return CardManager().cards
+
+    def battle(self, player1, player2, seed=None, on_event=None):
         if player1 not in self.players or player2 not in self.players:
             return None
 
@@ -99,11 +77,13 @@ class Game:
         # Play battle sound
         self.safe_play_sound("battle")
 
-        # Create battle manager and start battle
-        battle_manager = BattleManager()
-        result, message = battle_manager.start_battle(p1, p2)
+        # Reuse one battle manager so the history store is opened once
+        if self.battle_manager is None:
+            self.battle_manager = BattleManager()
+        result, message = self.battle_manager.start_battle(p1, p2, seed=seed, rng=self.rng, on_event=on_event)
 
         if result:
+            self.last_battle_seed = result["seed"]
             winner = p1 if result["winner"] == p1.username else p2
             loser = p2 if winner == p1 else p1
 
@@ -127,28 +107,78 @@ class GameApp(ctk.CTk):
         ctk.set_appearance_mode("dark")
         ctk.set_default_color_theme("blue")
         
-        # Initialize game
+        # Plug images and sound into the headless game core, then initialize game
+        install_ui_adapter()
         self.game = Game()
         self.current_player = None
+
+        # Battles run here, one at a time, so the window keeps handling input
+        self.battle_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="battle")
+        self.battle_future = None
+
+        # Decode screen art off the UI thread while the login screen is up
+        self.preloader = AssetPreloader(preload_jobs(), on_loaded=self.on_asset_loaded)
         
         # Setup UI
         self.setup_ui()
+        self.after(PRELOAD_POLL_MS, self.poll_preloader)
+
+        # Write-behind: changed players are flushed periodically instead of on every edit
+        self.after(AUTOSAVE_INTERVAL_MS, self.autosave)
+        self.after(0, self.tick_scheduler)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def autosave(self):
+        # A running battle is still changing its players and saves them when it ends
+        if not self.battle_running():
+            self.game.save_game_data()
+        self.after(AUTOSAVE_INTERVAL_MS, self.autosave)
+
+    def tick_scheduler(self):
+        # Chest unlocks, offer rotations and rewards; overdue timers fire on the first tick
+        if not self.battle_running():
+            self.game.tick()
+        self.after(SCHEDULER_TICK_MS, self.tick_scheduler)
+
+    def battle_running(self):
+        return self.battle_future is not None and not self.battle_future.done()
+
+    def poll_preloader(self):
+        progress = self.preloader.poll()
+        self.preload_bar.set(progress)
+        if self.preloader.finished:
+            self.preload_bar.pack_forget()
+            self.preload_label.pack_forget()
+            return
+        self.preload_label.configure(text=f"Loading assets... {self.preloader.done}/{self.preloader.total}")
+        self.after(PRELOAD_POLL_MS, self.poll_preloader)
+
+    def on_asset_loaded(self, path, size, image):
+        # The login screen is already showing when its background finishes decoding
+        if path == MAIN_MENU_BACKGROUND and self.bg_label is None:
+            self.bg_label = ctk.CTkLabel(self.main_container, image=image, text="")
+            self.bg_label.place(x=0, y=0, relwidth=1, relheight=1)
+            self.bg_label.lower()
+
+    def place_background(self, parent, path):
+        # Preloaded backgrounds come straight from the asset cache
+        image = load_image(path, BACKGROUND_SIZE)
+        if image is not None:
+            label = ctk.CTkLabel(parent, image=image, text="")
+            label.place(x=0, y=0, relwidth=1, relheight=1)
+
+    def on_close(self):
+        self.battle_executor.shutdown(wait=True)
+        self.game.save_game_data()
+        self.destroy()
         
     def setup_ui(self):
         # Main container with animated background
         self.main_container = ctk.CTkFrame(self, fg_color="#2b2b2b")
         self.main_container.pack(fill="both", expand=True, padx=20, pady=20)
         
-        # Background image with animation
-        try:
-            bg_image = Image.open("assets/backgrounds/main_menu.png")
-            bg_image = bg_image.resize((1200, 800))
-            self.bg_photo = ctk.CTkImage(bg_image, size=(1200, 800))
-            self.bg_label = ctk.CTkLabel(self.main_container, image=self.bg_photo, text="")
-            self.bg_label.place(x=0, y=0, relwidth=1, relheight=1)
-        except FileNotFoundError:
-            # If no background image, use a colorful gradient
-            self.main_container.configure(fg_color="#2b2b2b")
+        # Background image, placed by on_asset_loaded once the preloader has decoded it
+        self.bg_label = None
             
         # Login frame with animation
         self.login_frame = ctk.CTkFrame(self.main_container, fg_color="transparent")
@@ -186,6 +216,13 @@ class GameApp(ctk.CTk):
                                         text_color="black",
                                         corner_radius=10)
         self.login_button.pack(pady=20, padx=20)
+
+        # Asset preload progress, hidden once everything is decoded
+        self.preload_bar = ctk.CTkProgressBar(self.login_box, width=300)
+        self.preload_bar.set(0)
+        self.preload_bar.pack(pady=(10, 0))
+        self.preload_label = ctk.CTkLabel(self.login_box, text="Loading assets...", font=("Comic Sans MS", 12))
+        self.preload_label.pack(pady=(0, 10))
         
         # Game frame (initially hidden)
         self.game_frame = ctk.CTkFrame(self.main_container, fg_color="transparent")
@@ -196,44 +233,8 @@ class GameApp(ctk.CTk):
             return
             
         if username not in self.game.players:
+            # New players start with the starter deck (Player.load_initial_cards)
             self.game.add_player(username)
-            # Give new player basic cards
-            player = self.game.players[username]
-            basic_cards = [
-                Card(
-                    id="basic_warrior",
-                    name="Basic Warrior",
-                    rarity=CardRarity.COMMON,
-                    type=CardType.TROOP,
-                    attack=5,
-                    defense=5,
-                    cost=2,
-                    description="A basic warrior ready for battle"
-                ),
-                Card(
-                    id="basic_archer",
-                    name="Basic Archer",
-                    rarity=CardRarity.COMMON,
-                    type=CardType.TROOP,
-                    attack=4,
-                    defense=3,
-                    cost=2,
-                    description="A basic archer with ranged attacks"
-                ),
-                Card(
-                    id="basic_tank",
-                    name="Basic Tank",
-                    rarity=CardRarity.COMMON,
-                    type=CardType.TROOP,
-                    attack=3,
-                    defense=7,
-                    cost=3,
-                    description="A basic tank with high defense"
-                )
-            ]
-            for card in basic_cards:
-                player.add_card(card)
-                player.add_to_deck(card)
             
         self.current_player = self.game.players[username]
         self.show_game_frame()
@@ -312,14 +313,7 @@ class GameApp(ctk.CTk):
         battle_frame = ctk.CTkFrame(self.game_frame, fg_color="#1a1a1a")
         battle_frame.pack(fill="both", expand=True, padx=20, pady=20)
         
-        try:
-            battle_bg = Image.open("assets/backgrounds/battle.png")
-            battle_bg = battle_bg.resize((1200, 800))
-            battle_bg_photo = ctk.CTkImage(battle_bg, size=(1200, 800))
-            battle_bg_label = ctk.CTkLabel(battle_frame, image=battle_bg_photo, text="")
-            battle_bg_label.place(x=0, y=0, relwidth=1, relheight=1)
-        except FileNotFoundError:
-            pass
+        self.place_background(battle_frame, "assets/backgrounds/battle.png")
         
         # Header with animated back button
         header_frame = ctk.CTkFrame(battle_frame, fg_color="transparent")
@@ -381,102 +375,75 @@ class GameApp(ctk.CTk):
         # Add opponent to game if not exists
         if opponent_name not in self.game.players:
             self.game.add_player(opponent_name)
-            # Give opponent basic cards
-            opponent = self.game.players[opponent_name]
-            basic_cards = [
-                Card(
-                    id="basic_warrior",
-                    name="Basic Warrior",
-                    rarity=CardRarity.COMMON,
-                    type=CardType.TROOP,
-                    attack=5,
-                    defense=5,
-                    cost=2,
-                    description="A basic warrior ready for battle"
-                ),
-                Card(
-                    id="basic_archer",
-                    name="Basic Archer",
-                    rarity=CardRarity.COMMON,
-                    type=CardType.TROOP,
-                    attack=4,
-                    defense=3,
-                    cost=2,
-                    description="A basic archer with ranged attacks"
-                ),
-                Card(
-                    id="basic_tank",
-                    name="Basic Tank",
-                    rarity=CardRarity.COMMON,
-                    type=CardType.TROOP,
-                    attack=3,
-                    defense=7,
-                    cost=3,
-                    description="A basic tank with high defense"
-                )
-            ]
-            for card in basic_cards:
-                opponent.add_card(card)
-                opponent.add_to_deck(card)
         
         # Start battle
-        result = self.game.battle(self.current_player.username, opponent_name)
-        if result is None:
-            # Show error message if battle cannot be started
-            self.show_battle_error("Cannot start battle. Make sure both players have cards in their deck.")
-            return
-            
-        winner, loser = result
-        self.show_battle_result(winner, loser)
+        self.run_battle(opponent_name, "Cannot start battle. Make sure both players have cards in their deck.")
         
     def start_training_battle(self):
         # Create a training bot
         bot_name = "Training Bot"
         if bot_name not in self.game.players:
             self.game.add_player(bot_name)
-            bot = self.game.players[bot_name]
-            # Give bot some basic cards
-            basic_cards = [
-                Card(
-                    id="basic_warrior",
-                    name="Basic Warrior",
-                    rarity=CardRarity.COMMON,
-                    type=CardType.TROOP,
-                    attack=5,
-                    defense=5,
-                    cost=2,
-                    description="A basic warrior ready for battle"
-                ),
-                Card(
-                    id="basic_archer",
-                    name="Basic Archer",
-                    rarity=CardRarity.COMMON,
-                    type=CardType.TROOP,
-                    attack=4,
-                    defense=3,
-                    cost=2,
-                    description="A basic archer with ranged attacks"
-                ),
-                Card(
-                    id="basic_tank",
-                    name="Basic Tank",
-                    rarity=CardRarity.COMMON,
-                    type=CardType.TROOP,
-                    attack=3,
-                    defense=7,
-                    cost=3,
-                    description="A basic tank with high defense"
-                )
-            ]
-            for card in basic_cards:
-                bot.add_card(card)
-                bot.add_to_deck(card)
         
         # Start battle
-        result = self.game.battle(self.current_player.username, bot_name)
+        self.run_battle(bot_name, "Cannot start battle. Make sure you have cards in your deck.")
+
+    def run_battle(self, opponent_name, error_message):
+        if self.battle_running():
+            return
+        # Turn events are produced on the battle thread and shown from the Tk thread
+        events = queue.SimpleQueue()
+        self.battle_future = self.battle_executor.submit(
+            self.game.battle, self.current_player.username, opponent_name, on_event=events.put)
+        self.show_battle_progress(opponent_name)
+        self.after(BATTLE_POLL_MS, self.poll_battle, events, error_message)
+
+    def show_battle_progress(self, opponent_name):
+        for widget in self.game_frame.winfo_children():
+            widget.destroy()
+            
+        progress_frame = ctk.CTkFrame(self.game_frame, fg_color="#1a1a1a")
+        progress_frame.pack(fill="both", expand=True, padx=20, pady=20)
+        
+        title_label = ctk.CTkLabel(progress_frame,
+                                 text=f"⚔️ {self.current_player.username} vs {opponent_name} ⚔️",
+                                 font=("Comic Sans MS", 32, "bold"),
+                                 text_color="#FFD700")
+        title_label.pack(pady=50)
+        
+        progress_bar = ctk.CTkProgressBar(progress_frame, mode="indeterminate", width=400)
+        progress_bar.pack(pady=20)
+        progress_bar.start()
+        
+        self.battle_status_label = ctk.CTkLabel(progress_frame,
+                                              text="The battle begins...",
+                                              font=("Comic Sans MS", 20),
+                                              text_color="white")
+        self.battle_status_label.pack(pady=20)
+
+    def poll_battle(self, events, error_message):
+        while True:
+            try:
+                event = events.get_nowait()
+            except queue.Empty:
+                break
+            if event["type"] == "turn":
+                self.battle_status_label.configure(
+                    text=f"Turn {event['turn']}  |  ❤️ {event['player1_health']} vs ❤️ {event['player2_health']}")
+
+        if not self.battle_future.done():
+            self.after(BATTLE_POLL_MS, self.poll_battle, events, error_message)
+            return
+
+        try:
+            result = self.battle_future.result()
+        except Exception:
+            # Otherwise the error escapes into Tk and the progress screen never goes away
+            traceback.print_exc()
+            result = None
         if result is None:
             # Show error message if battle cannot be started
-            self.show_battle_error("Cannot start battle. Make sure you have cards in your deck.")
+            self.show_battle_error(error_message)
             return
             
         winner, loser = result
@@ -541,14 +508,7 @@ class GameApp(ctk.CTk):
         deck_frame = ctk.CTkFrame(self.game_frame, fg_color="#1a1a1a")
         deck_frame.pack(fill="both", expand=True, padx=20, pady=20)
         
-        try:
-            deck_bg = Image.open("assets/backgrounds/deck_builder.png")
-            deck_bg = deck_bg.resize((1200, 800))
-            deck_bg_photo = ctk.CTkImage(deck_bg, size=(1200, 800))
-            deck_bg_label = ctk.CTkLabel(deck_frame, image=deck_bg_photo, text="")
-            deck_bg_label.place(x=0, y=0, relwidth=1, relheight=1)
-        except FileNotFoundError:
-            pass
+        self.place_background(deck_frame, "assets/backgrounds/deck_builder.png")
         
         # Header with animated back button
         header_frame = ctk.CTkFrame(deck_frame, fg_color="transparent")
@@ -580,110 +540,93 @@ class GameApp(ctk.CTk):
         available_frame = ctk.CTkFrame(columns_frame, fg_color="#2b2b2b")
         available_frame.pack(side="left", fill="both", expand=True, padx=10)
         
-        available_label = ctk.CTkLabel(available_frame,
-                                     text="Your Cards",
-                                     font=("Comic Sans MS", 16, "bold"),
-                                     text_color="#FFD700")
-        available_label.pack(pady=10)
+        self.available_label = ctk.CTkLabel(available_frame,
+                                          text="Your Cards",
+                                          font=("Comic Sans MS", 16, "bold"),
+                                          text_color="#FFD700")
+        self.available_label.pack(pady=10)
         
-        # Create scrollable frame for available cards
-        available_cards_frame = ctk.CTkScrollableFrame(available_frame, fg_color="transparent")
-        available_cards_frame.pack(fill="both", expand=True, padx=10, pady=10)
+        # Virtualized list of available cards; only the rows in view are widgets
+        self.available_list = VirtualList(available_frame, CARD_ROW_HEIGHT, self.create_card_row,
+                                          lambda row, card: self.bind_card_row(
+                                              row, card, ADD_BUTTON_STYLE, lambda: self.add_card_to_deck(card)))
+        self.available_list.pack(fill="both", expand=True, padx=10, pady=10)
         
         # Current deck column
         deck_frame = ctk.CTkFrame(columns_frame, fg_color="#2b2b2b")
         deck_frame.pack(side="right", fill="both", expand=True, padx=10)
         
-        deck_label = ctk.CTkLabel(deck_frame,
-                                text="Your Deck",
-                                font=("Comic Sans MS", 16, "bold"),
-                                text_color="#FFD700")
-        deck_label.pack(pady=10)
-        
-        # Create scrollable frame for deck cards
-        deck_cards_frame = ctk.CTkScrollableFrame(deck_frame, fg_color="transparent")
-        deck_cards_frame.pack(fill="both", expand=True, padx=10, pady=10)
-        
-        # Display available cards
-        for card in self.current_player.cards:
-            card_frame = ctk.CTkFrame(available_cards_frame, fg_color="#1a1a1a")
-            card_frame.pack(fill="x", pady=5)
-            
-            # Card image
-            if card.image:
-                image_label = ctk.CTkLabel(card_frame, image=card.image, text="")
-                image_label.pack(side="left", padx=5)
-            
-            # Card info
-            info_frame = ctk.CTkFrame(card_frame, fg_color="transparent")
-            info_frame.pack(side="left", fill="x", expand=True, padx=5)
-            
-            name_label = ctk.CTkLabel(info_frame,
-                                    text=card.name,
-                                    font=("Comic Sans MS", 14, "bold"),
-                                    text_color=card.get_rarity_color())
-            name_label.pack(anchor="w")
-            
-            stats_label = ctk.CTkLabel(info_frame,
-                                     text=f"⚔️ {card.attack} | 🛡️ {card.defense} | 💰 {card.cost}",
-                                     font=("Comic Sans MS", 12),
-                                     text_color="white")
-            stats_label.pack(anchor="w")
-            
-            # Add to deck button
-            add_button = ctk.CTkButton(card_frame,
-                                     text="Add to Deck",
-                                     command=lambda c=card: self.add_card_to_deck(c),
-                                     width=100,
-                                     fg_color="#FFD700",
-                                     hover_color="#FFA500",
-                                     text_color="black",
-                                     font=("Comic Sans MS", 12, "bold"),
-                                     corner_radius=5)
-            add_button.pack(side="right", padx=5)
-        
-        # Display deck cards
-        for card in self.current_player.deck:
-            card_frame = ctk.CTkFrame(deck_cards_frame, fg_color="#1a1a1a")
-            card_frame.pack(fill="x", pady=5)
-            
-            # Card image
-            if card.image:
-                image_label = ctk.CTkLabel(card_frame, image=card.image, text="")
-                image_label.pack(side="left", padx=5)
-            
-            # Card info
-            info_frame = ctk.CTkFrame(card_frame, fg_color="transparent")
-            info_frame.pack(side="left", fill="x", expand=True, padx=5)
-            
-            name_label = ctk.CTkLabel(info_frame,
-                                    text=card.name,
-                                    font=("Comic Sans MS", 14, "bold"),
-                                    text_color=card.get_rarity_color())
-            name_label.pack(anchor="w")
-            
-            stats_label = ctk.CTkLabel(info_frame,
-                                     text=f"⚔️ {card.attack} | 🛡️ {card.defense} | 💰 {card.cost}",
-                                     font=("Comic Sans MS", 12),
-                                     text_color="white")
-            stats_label.pack(anchor="w")
-            
-            # Remove from deck button
-            remove_button = ctk.CTkButton(card_frame,
-                                        text="Remove",
-                                        command=lambda c=card: self.remove_card_from_deck(c),
-                                        width=100,
-                                        fg_color="#FF4444",
-                                        hover_color="#FF0000",
-                                        text_color="white",
-                                        font=("Comic Sans MS", 12, "bold"),
-                                        corner_radius=5)
-            remove_button.pack(side="right", padx=5)
+        self.deck_label = ctk.CTkLabel(deck_frame,
+                                     text="Your Deck",
+                                     font=("Comic Sans MS", 16, "bold"),
+                                     text_color="#FFD700")
+        self.deck_label.pack(pady=10)
+        
+        self.deck_list = VirtualList(deck_frame, CARD_ROW_HEIGHT, self.create_card_row,
+                                     lambda row, card: self.bind_card_row(
+                                         row, card, REMOVE_BUTTON_STYLE, lambda: self.remove_card_from_deck(card)))
+        self.deck_list.pack(fill="both", expand=True, padx=10, pady=10)
+        
+        # A card is listed in exactly one panel; deck edits move it between the
+        # two lists instead of rebuilding them
+        in_deck = {id(card) for card in self.current_player.deck}
+        self.available_list.set_items(card for card in self.current_player.cards if id(card) not in in_deck)
+        self.deck_list.set_items(self.current_player.deck)
+        self.update_deck_counters()
+            
+    def create_card_row(self, parent, height, fg_color="#1a1a1a"):
+        # Empty, recyclable card row; bind_card_row fills it in for a card
+        row = ctk.CTkFrame(parent, fg_color=fg_color, height=height)
+        row.pack_propagate(False)
+        
+        # Card image
+        row.image_label = ctk.CTkLabel(row, text="")
+        row.image_label.pack(side="left", padx=5)
+        
+        # Card info
+        info_frame = ctk.CTkFrame(row, fg_color="transparent")
+        info_frame.pack(side="left", fill="x", expand=True, padx=5)
+        
+        row.name_label = ctk.CTkLabel(info_frame, text="", font=("Comic Sans MS", 14, "bold"))
+        row.name_label.pack(anchor="w")
+        
+        row.stats_label = ctk.CTkLabel(info_frame, text="", font=("Comic Sans MS", 12), text_color="white")
+        row.stats_label.pack(anchor="w")
+        
+        # Price (shop only) and action button
+        action_frame = ctk.CTkFrame(row, fg_color="transparent")
+        action_frame.pack(side="right", padx=5)
+        
+        row.price_label = ctk.CTkLabel(action_frame, text="", font=("Comic Sans MS", 14, "bold"), text_color="#FFD700")
+        
+        row.button = ctk.CTkButton(action_frame,
+                                 width=100,
+                                 font=("Comic Sans MS", 12, "bold"),
+                                 corner_radius=5)
+        row.button.pack(side="right", padx=5)
+        return row
+
+    def bind_card_row(self, row, card, button_style, command, price=None):
+        row.image_label.configure(image=card.image)
+        row.name_label.configure(text=card.name, text_color=card.get_rarity_color())
+        row.stats_label.configure(text=f"⚔️ {card.attack} | 🛡️ {card.defense} | 💰 {card.cost}")
+        if price is None:
+            row.price_label.pack_forget()
+        else:
+            row.price_label.configure(text=f"💰 {price}")
+            row.price_label.pack(side="left", padx=5)
+        row.button.configure(command=command, **button_style)
+
+    def update_deck_counters(self):
+        self.available_label.configure(text=f"Your Cards ({len(self.available_list.items)})")
+        self.deck_label.configure(text=f"Your Deck ({len(self.current_player.deck)}/{DECK_SIZE})")
             
     def add_card_to_deck(self, card):
-        if len(self.current_player.deck) < 8:
+        if len(self.current_player.deck) < DECK_SIZE:
             if self.current_player.add_to_deck(card):
-                self.show_deck_builder()
+                self.available_list.remove(card)
+                self.deck_list.append(card)
+                self.update_deck_counters()
                 # Play card sound effect
                 self.game.safe_play_sound("card_play")
             else:
@@ -692,9 +635,18 @@ class GameApp(ctk.CTk):
             self.show_error("Your deck is full! Remove a card first.")
             
     def remove_card_from_deck(self, card):
-        if card in self.current_player.deck:
-            self.current_player.deck.remove(card)
-            self.show_deck_builder()
+        if self.current_player.remove_from_deck(card):
+            self.deck_list.remove(card)
+            # Put the card back at its place in the collection order
+            in_deck = {id(c) for c in self.current_player.deck}
+            index = 0
+            for c in self.current_player.cards:
+                if c is card:
+                    break
+                if id(c) not in in_deck:
+                    index += 1
+            self.available_list.insert(index, card)
+            self.update_deck_counters()
             
     def show_error(self, message):
         error_frame = ctk.CTkFrame(self.game_frame, fg_color="#1a1a1a")
@@ -813,58 +765,19 @@ class GameApp(ctk.CTk):
         shop_content = ctk.CTkFrame(self.game_frame, fg_color="transparent")
         shop_content.pack(fill="both", expand=True, padx=20, pady=20)
         
-        # Create scrollable frame for cards
-        cards_frame = ctk.CTkScrollableFrame(shop_content, fg_color="transparent")
-        cards_frame.pack(fill="both", expand=True)
+        # Virtualized list of cards for sale; large catalogs only build the rows in view
+        cards_list = VirtualList(shop_content, CARD_ROW_HEIGHT,
+                                 lambda parent, height: self.create_card_row(parent, height, "#2b2b2b"),
+                                 self.bind_shop_card_row)
+        cards_list.pack(fill="both", expand=True)
         
-        # Display available cards for purchase
-        for card in self.game.cards.values():
-            if card not in self.current_player.cards:  # Only show cards the player doesn't have
-                card_frame = ctk.CTkFrame(cards_frame, fg_color="#2b2b2b")
-                card_frame.pack(fill="x", pady=5, padx=10)
-                
-                # Card image
-                if card.image:
-                    image_label = ctk.CTkLabel(card_frame, image=card.image, text="")
-                    image_label.pack(side="left", padx=5)
-                
-                # Card info
-                info_frame = ctk.CTkFrame(card_frame, fg_color="transparent")
-                info_frame.pack(side="left", fill="x", expand=True, padx=5)
-                
-                name_label = ctk.CTkLabel(info_frame,
-                                        text=card.name,
-                                        font=("Comic Sans MS", 14, "bold"),
-                                        text_color=card.get_rarity_color())
-                name_label.pack(anchor="w")
-                
-                stats_label = ctk.CTkLabel(info_frame,
-                                         text=f"⚔️ {card.attack} | 🛡️ {card.defense} | 💰 {card.cost}",
-                                         font=("Comic Sans MS", 12),
-                                         text_color="white")
-                stats_label.pack(anchor="w")
-                
-                # Price and buy button
-                price_frame = ctk.CTkFrame(card_frame, fg_color="transparent")
-                price_frame.pack(side="right", padx=5)
-                
-                price = self.calculate_card_price(card)
-                price_label = ctk.CTkLabel(price_frame,
-                                         text=f"💰 {price}",
-                                         font=("Comic Sans MS", 14, "bold"),
-                                         text_color="#FFD700")
-                price_label.pack(side="left", padx=5)
-                
-                buy_button = ctk.CTkButton(price_frame,
-                                         text="Buy",
-                                         command=lambda c=card, p=price: self.buy_card(c, p),
-                                         width=100,
-                                         fg_color="#FFD700",
-                                         hover_color="#FFA500",
-                                         text_color="black",
-                                         font=("Comic Sans MS", 12, "bold"),
-                                         corner_radius=5)
-                buy_button.pack(side="right", padx=5)
+        # Only show cards the player doesn't have
+        owned = {card.id for card in self.current_player.cards}
+        cards_list.set_items(card for card in self.game.cards.values() if card.id not in owned)
+
+    def bind_shop_card_row(self, row, card):
+        price = self.calculate_card_price(card)
+        self.bind_card_row(row, card, BUY_BUTTON_STYLE, lambda: self.buy_card(card, price), price)
                 
     def show_chests_shop(self):
         # Clear shop content
@@ -881,16 +794,8 @@ class GameApp(ctk.CTk):
         chests_frame = ctk.CTkFrame(shop_content, fg_color="transparent")
         chests_frame.pack(fill="both", expand=True)
         
-        # Define chest types and their prices
-        chests = [
-            {"name": "Wooden Chest", "price": 100, "color": "#8B4513", "rarity": "Common"},
-            {"name": "Silver Chest", "price": 250, "color": "#C0C0C0", "rarity": "Rare"},
-            {"name": "Golden Chest", "price": 500, "color": "#FFD700", "rarity": "Epic"},
-            {"name": "Magic Chest", "price": 1000, "color": "#9932CC", "rarity": "Legendary"}
-        ]
-        
         # Display chests in a grid
-        for i, chest in enumerate(chests):
+        for i, chest in enumerate(CHESTS):
             row = i // 2
             col = i % 2
             
@@ -898,13 +803,11 @@ class GameApp(ctk.CTk):
             chest_frame.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
             
             # Chest image
-            try:
-                chest_image = Image.open(f"assets/chests/{chest['name'].lower().replace(' ', '_')}.png")
-                chest_image = chest_image.resize((200, 200))
-                chest_photo = ctk.CTkImage(chest_image, size=(200, 200))
+            chest_photo = load_image(chest_image_path(chest), CHEST_IMAGE_SIZE)
+            if chest_photo is not None:
                 image_label = ctk.CTkLabel(chest_frame, image=chest_photo, text="")
                 image_label.pack(pady=10)
-            except FileNotFoundError:
+            else:
                 # Create placeholder if image not found
                 placeholder = ctk.CTkLabel(chest_frame,
                                          text="🎁",
@@ -964,7 +867,8 @@ class GameApp(ctk.CTk):
     def buy_card(self, card, price):
         if self.current_player.gold >= price:
             self.current_player.spend_gold(price)
-            self.current_player.add_card(card)
+            # The player gets their own copy of the catalog card
+            self.current_player.add_card(Card.from_definition(card.definition))
             self.show_shop()
             # Play purchase sound
             self.game.safe_play_sound("shop")
@@ -974,7 +878,7 @@ class GameApp(ctk.CTk):
     def buy_chest(self, chest):
         if self.current_player.gold >= chest["price"]:
             self.current_player.spend_gold(chest["price"])
-            self.current_player.add_chest(chest["name"], datetime.now())
+            self.game.add_chest(self.current_player.username, chest["name"], datetime.now())
             self.show_shop()
             # Play chest sound
             self.game.safe_play_sound("chest_collect")
@@ -1,18 +1,96 @@
-import pygame
-from PIL import Image, ImageTk
-import customtkinter as ctk
 import os
 from datetime import datetime
-import json
+from functools import cached_property, lru_cache
 import sys
+import uuid
 from pathlib import Path
 
 # Adiciona o diretório pai ao path para importar corretamente
 sys.path.append(str(Path(__file__).parent.parent))
-from game.cards import Card, CardRarity, CardType
+from game.assets import load_image
+from game.audio import sound_bank
+from game.cards import Card
+from game.catalog import card_catalog, compile_card, validate_card
+
+# Sounds played by the economy methods, preloaded by Game
+ECONOMY_SOUNDS = ("gold", "gem", "card_collect", "trophy", "chest_collect")
+
+INITIAL_DECK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "initial_deck.json")
+# Where owned cards come from: the starter deck and CardManager's catalog (shop, chests)
+CARD_SOURCES = (INITIAL_DECK_PATH, "data/cards.json")
+
+# Built-in starter deck, used when data/initial_deck.json does not exist
+STARTER_CARDS = [
+    {
+        "id": "basic_warrior",
+        "name": "Basic Warrior",
+        "rarity": "Common",
+        "type": "Troop",
+        "attack": 5,
+        "defense": 5,
+        "cost": 2,
+        "description": "A basic warrior ready for battle"
+    },
+    {
+        "id": "basic_archer",
+        "name": "Basic Archer",
+        "rarity": "Common",
+        "type": "Troop",
+        "attack": 4,
+        "defense": 3,
+        "cost": 2,
+        "description": "A basic archer with ranged attacks"
+    },
+    {
+        "id": "basic_tank",
+        "name": "Basic Tank",
+        "rarity": "Common",
+        "type": "Troop",
+        "attack": 3,
+        "defense": 7,
+        "cost": 3,
+        "description": "A basic tank with high defense"
+    }
+]
+
+# Fields saved by the player store; assigning any of them marks it dirty
+PERSISTED_FIELDS = (
+    "level",
+    "experience",
+    "gold",
+    "gems",
+    "trophies",
+    "cards",
+    "deck",
+    "chests",
+    "last_login",
+    "daily_rewards",
+    "achievements",
+    "pity"
+)
+
+@lru_cache(maxsize=None)
+def starter_definitions():
+    # Compiled once, so every player shares the same definitions
+    for index, card_data in enumerate(STARTER_CARDS):
+        validate_card(card_data, f"STARTER_CARDS[{index}]")
+    return tuple(compile_card(card_data) for card_data in STARTER_CARDS)
+
+
+def owned_card_definitions():
+    """id -> shared CardDefinition for every card a player can own; later sources win."""
+    definitions = {definition.id: definition for definition in starter_definitions()}
+    for path in CARD_SOURCES:
+        try:
+            definitions.update(card_catalog.by_id(path))
+        except FileNotFoundError:
+            pass
+    return definitions
 
 class Player:
     def __init__(self, username):
+        # A brand new player has every field dirty until it is first saved
+        self._dirty = set()
         self.username = username
         self.level = 1
         self.experience = 0
@@ -25,78 +103,119 @@ class Player:
         self.last_login = datetime.now()
         self.daily_rewards = []
         self.achievements = {}
-        self.avatar = None
-        self.load_avatar()
+        self.pity = {}  # Drop table name -> {rarity: chest cards since that rarity}
+        self.missing_cards = []  # Saved cards whose id left the catalog, kept as saved
         self.load_initial_cards()
         
     def load_initial_cards(self):
+        # Starter cards share the catalog's parsed definitions; only progression is per player
         try:
-            # Verifica o caminho atual
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            initial_deck_path = os.path.join(current_dir, "..", "data", "initial_deck.json")
-            print(f"Tentando carregar deck inicial de: {initial_deck_path}")
-            
-            if not os.path.exists(initial_deck_path):
-                raise FileNotFoundError(f"Arquivo não encontrado: {initial_deck_path}")
-            
-            with open(initial_deck_path, "r") as f:
-                initial_cards = json.load(f)
-                print(f"Cards encontrados: {len(initial_cards['cards'])}")
-                
-                # Primeiro adiciona todos os cards à coleção
-                for card_data in initial_cards["cards"]:
-                    print(f"Processando card: {card_data['name']}")
-                    try:
-                        card = Card(
-                            id=card_data["id"],
-                            name=card_data["name"],
-                            rarity=CardRarity(card_data["rarity"]),
-                            type=CardType(card_data["type"]),
-                            attack=card_data["attack"],
-                            defense=card_data["defense"],
-                            cost=card_data["cost"],
-                            description=card_data["description"],
-                            special_ability=card_data.get("special_ability")
-                        )
-                        self.cards.append(card)  # Adiciona direto à lista de cards
-                        print(f"Card {card.name} adicionado à coleção")
-                    except Exception as e:
-                        print(f"Erro ao criar card {card_data['name']}: {str(e)}")
-                
-                # Depois adiciona os cards ao deck
-                for card in self.cards:
-                    self.deck.append(card)  # Adiciona direto ao deck
-                    print(f"Card {card.name} adicionado ao deck")
-                    
-        except FileNotFoundError as e:
-            print(f"Arquivo de deck inicial não encontrado: {str(e)}")
+            definitions = card_catalog.definitions(INITIAL_DECK_PATH)
+        except FileNotFoundError:
+            definitions = starter_definitions()
         except Exception as e:
             print(f"Erro ao carregar deck inicial: {str(e)}")
-        
+            return
+        self.cards = [Card.from_definition(definition) for definition in definitions]
+        self.deck = list(self.cards)
+
+    def __setattr__(self, name, value):
+        if name in PERSISTED_FIELDS:
+            self._dirty.add(name)
+        object.__setattr__(self, name, value)
+
+    def mark_dirty(self, *fields):
+        # For in-place changes such as appending to cards, deck or chests
+        self._dirty.update(fields)
+
+    @property
+    def dirty(self):
+        return bool(self._dirty)
+
+    def take_dirty(self):
+        """Return the set of changed fields and mark the player clean."""
+        dirty, self._dirty = self._dirty, set()
+        return dirty
+
+    def to_record(self, fields=PERSISTED_FIELDS):
+        """Serializable values of the given persisted fields."""
+        values = {
+            "level": lambda: self.level,
+            "experience": lambda: self.experience,
+            "gold": lambda: self.gold,
+            "gems": lambda: self.gems,
+            "trophies": lambda: self.trophies,
+            "cards": lambda: [card.to_dict() for card in self.cards] + self.missing_cards,
+            # Deck entries are positions in the card collection
+            "deck": lambda: [self.cards.index(card) for card in self.deck if card in self.cards],
+            "chests": lambda: [
+                dict(chest, unlock_time=chest["unlock_time"].isoformat()
+                     if isinstance(chest["unlock_time"], datetime) else chest["unlock_time"])
+                for chest in self.chests
+            ],
+            "last_login": lambda: self.last_login.isoformat(),
+            "daily_rewards": lambda: self.daily_rewards,
+            "achievements": lambda: self.achievements,
+            "pity": lambda: self.pity
+        }
+        return {field: values[field]() for field in fields}
+
+    @classmethod
+    def from_record(cls, username, record):
+        """Rebuild a saved player without loading the initial deck."""
+        player = cls.__new__(cls)
+        object.__setattr__(player, "_dirty", set())
+        player.username = username
+        player.level = record["level"]
+        player.experience = record["experience"]
+        player.gold = record["gold"]
+        player.gems = record["gems"]
+        player.trophies = record["trophies"]
+        # Saved cards only hold id and progression; static data is the catalog's shared definition
+        definitions = owned_card_definitions()
+        player.cards = []
+        player.missing_cards = []
+        positions = {}  # saved index -> index in player.cards
+        for index, data in enumerate(record["cards"]):
+            definition = definitions.get(data["id"])
+            if definition is None:
+                print(f"Card '{data['id']}' of {username} is no longer in the catalog; keeping it aside")
+                player.missing_cards.append(data)
+                continue
+            positions[index] = len(player.cards)
+            player.cards.append(Card.from_dict(data, definition))
+        player.deck = [player.cards[positions[index]] for index in record["deck"] if index in positions]
+        player.chests = [
+            dict(chest, unlock_time=datetime.fromisoformat(chest["unlock_time"])
+                 if isinstance(chest["unlock_time"], str) else chest["unlock_time"])
+            for chest in record["chests"]
+        ]
+        player.last_login = datetime.fromisoformat(record["last_login"])
+        player.daily_rewards = record["daily_rewards"]
+        player.achievements = record["achievements"]
+        player.pity = record.get("pity") or {}
+        player.take_dirty()
+        return player
+
+    @cached_property
+    def avatar(self):
+        # Resolved on first render; avatars go through the shared asset cache, so
+        # every player without a custom avatar reuses the same decoded default image
+        avatar = load_image(f"assets/avatars/{self.username}.png", (100, 100))
+        if avatar is None:
+            # Use default avatar if not found, or a colorful placeholder if no default avatar
+            avatar = load_image("assets/avatars/default.png", (100, 100), placeholder_color='blue')
+        return avatar
+
     def load_avatar(self):
-        try:
-            avatar_path = f"assets/avatars/{self.username}.png"
-            self.avatar = Image.open(avatar_path)
-            self.avatar = self.avatar.resize((100, 100))
-            self.avatar = ctk.CTkImage(self.avatar, size=(100, 100))
-        except FileNotFoundError:
-            # Use default avatar if not found
-            try:
-                default_avatar = Image.open("assets/avatars/default.png")
-                default_avatar = default_avatar.resize((100, 100))
-                self.avatar = ctk.CTkImage(default_avatar, size=(100, 100))
-            except FileNotFoundError:
-                # Create a colorful placeholder if no default avatar
-                self.avatar = ctk.CTkImage(Image.new('RGB', (100, 100), color='blue'), size=(100, 100))
+        # (Re)load the avatar now instead of waiting for the first render
+        self.__dict__.pop("avatar", None)
+        return self.avatar
                 
     def earn_gold(self, amount):
         self.gold += amount
         # Play gold sound effect
-        try:
-            gold_sound = pygame.mixer.Sound("assets/sounds/gold.mp3")
-            gold_sound.play()
-        except:
-            pass
+        sound_bank.play("gold")
             
     def spend_gold(self, amount):
         if self.gold >= amount:
@@ -107,11 +226,7 @@ class Player:
     def earn_gems(self, amount):
         self.gems += amount
         # Play gem sound effect
-        try:
-            gem_sound = pygame.mixer.Sound("assets/sounds/gem.mp3")
-            gem_sound.play()
-        except:
-            pass
+        sound_bank.play("gem")
             
     def spend_gems(self, amount):
         if self.gems >= amount:
@@ -122,37 +237,58 @@ class Player:
     def add_card(self, card):
         if card not in self.cards:  # Evita duplicatas
             self.cards.append(card)
+            self.mark_dirty("cards")
             # Play card sound effect
-            try:
-                card_sound = pygame.mixer.Sound("assets/sounds/card_collect.mp3")
-                card_sound.play()
-            except:
-                pass
+            sound_bank.play("card_collect")
             
     def add_to_deck(self, card):
         if len(self.deck) < 8 and card in self.cards and card not in self.deck:  # Evita duplicatas no deck
             self.deck.append(card)
+            self.mark_dirty("deck")
+            return True
+        return False
+
+    def remove_from_deck(self, card):
+        if card in self.deck:
+            self.deck.remove(card)
+            self.mark_dirty("deck")
             return True
         return False
         
     def earn_trophies(self, amount):
         self.trophies += amount
         # Play trophy sound effect
-        try:
-            trophy_sound = pygame.mixer.Sound("assets/sounds/trophy.mp3")
-            trophy_sound.play()
-        except:
-            pass
+        sound_bank.play("trophy")
             
     def add_chest(self, chest_type, unlock_time):
-        self.chests.append({
+        """Add a locked chest and return it; Game.add_chest also schedules its unlock."""
+        chest = {
+            "id": uuid.uuid4().hex,
             "type": chest_type,
             "unlock_time": unlock_time,
             "unlocked": False
-        })
+        }
+        self.chests.append(chest)
+        self.mark_dirty("chests")
         # Play chest sound effect
-        try:
-            chest_sound = pygame.mixer.Sound("assets/sounds/chest_collect.mp3")
-            chest_sound.play()
-        except:
-            pass 
\ No newline at end of file
+        sound_bank.play("chest_collect")
+        return chest
+
+    def open_chest(self, index, drops, rng=None, now=None):
+        """Open the chest at index with a drops.DropEngine and add its cards to the collection.
+
+        Returns the new cards, or None if the chest is still locked.
+        """
+        chest = self.chests[index]
+        if not chest["unlocked"] and chest["unlock_time"] > (now or datetime.now()):
+            return None
+        # Drawn on a copy of the pity counters: if the draw raises (unknown chest
+        # type, empty rarity pool) the player keeps the chest and the counters
+        pity = {table: dict(counters) for table, counters in self.pity.items()}
+        cards = drops.open(chest["type"], rng=rng, pity=pity)
+        del self.chests[index]
+        self.pity = pity
+        self.mark_dirty("chests")
+        for card in cards:
+            self.add_card(card)
+        return cards
\ No newline at end of file
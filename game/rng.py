@@ -0,0 +1,27 @@
+"""
+Seedable random number generation shared by battles, the shop and card draws.
+
+Every randomized subsystem takes an optional seed and/or random.Random instead
+of using the module-global generator, so a battle or an offer rotation can be
+replayed exactly from the seed stored in its record.
+"""
+import random
+
+# Source of fresh seeds when the caller does not provide one
+_seed_source = random.SystemRandom()
+
+
+def new_seed(rng=None):
+    return (rng or _seed_source).getrandbits(63)
+
+
+def resolve_rng(seed=None, rng=None):
+    """Return (random.Random, seed).
+
+    An explicit seed always wins. Otherwise a new seed is drawn from rng (or the
+    OS entropy pool), so the returned generator can always be recreated from
+    the returned seed.
+    """
+    if seed is None:
+        seed = new_seed(rng)
+    return random.Random(seed), seed
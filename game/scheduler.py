@@ -0,0 +1,140 @@
+"""
+Central timer scheduler.
+
+Timers (chest unlocks, shop offer rotations, reward grants) sit in one
+min-heap ordered by due time, so finding what is due costs O(log n) per timer
+fired instead of polling every player's chests. Pending timers are persisted
+to a JSON file and fired on the first run_due() after a restart; repeating
+timers that missed several periods fire once and move to their next future
+due time.
+
+Game owns the scheduler and schedules timers itself (see Game.add_chest).
+"""
+import heapq
+import itertools
+import json
+import os
+import uuid
+from datetime import datetime
+
+
+def _timestamp(due):
+    return due.timestamp() if isinstance(due, datetime) else float(due)
+
+
+class Scheduler:
+    def __init__(self, path="data/schedule.json"):
+        self.path = path
+        self.handlers = {}
+        self._heap = []  # (due, seq, key)
+        self._timers = {}  # key -> {"kind", "due", "payload", "interval"}
+        self._seq = itertools.count()
+        self._dirty = False
+        self.load()
+
+    def __len__(self):
+        return len(self._timers)
+
+    def __contains__(self, key):
+        return key in self._timers
+
+    def register(self, kind, handler):
+        """handler(payload, due) is called from run_due() for every timer of this kind."""
+        self.handlers[kind] = handler
+
+    def schedule(self, kind, due, payload=None, key=None, interval=None):
+        """Add or replace the timer named key; due is a datetime or a Unix timestamp.
+
+        interval (seconds) makes the timer repeat. Returns the key.
+        """
+        if key is None:
+            # Unique across restarts, unlike self._seq, so a persisted timer is never replaced
+            key = f"{kind}:{uuid.uuid4().hex}"
+        due = _timestamp(due)
+        # Any older heap entry for this key goes stale; it is skipped when popped
+        self._timers[key] = {"kind": kind, "due": due, "payload": payload, "interval": interval}
+        heapq.heappush(self._heap, (due, next(self._seq), key))
+        self._dirty = True
+        self._compact()
+        return key
+
+    def cancel(self, key):
+        if self._timers.pop(key, None) is not None:
+            self._dirty = True
+            self._compact()
+            return True
+        return False
+
+    def next_due(self):
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def run_due(self, now=None):
+        """Fire every timer due at or before now, oldest first; returns how many fired."""
+        now = _timestamp(now or datetime.now())
+        fired = 0
+        while True:
+            self._drop_stale()
+            if not self._heap or self._heap[0][0] > now:
+                break
+            due, _, key = heapq.heappop(self._heap)
+            timer = self._timers.pop(key)
+            self._dirty = True
+            if timer["interval"]:
+                # Missed periods are coalesced into a single firing
+                periods = int((now - due) // timer["interval"]) + 1
+                self.schedule(timer["kind"], due + periods * timer["interval"], timer["payload"], key,
+                              timer["interval"])
+            handler = self.handlers.get(timer["kind"])
+            if handler is None:
+                print(f"No handler for timer {key} ({timer['kind']})")
+                continue
+            try:
+                handler(timer["payload"], datetime.fromtimestamp(due))
+            except Exception as e:
+                print(f"Timer {key} failed: {str(e)}")
+            fired += 1
+        return fired
+
+    def load(self):
+        try:
+            with open(self.path, "r") as f:
+                timers = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            timers = {}
+        self._timers = {}
+        self._heap = []
+        for key, timer in timers.items():
+            self._timers[key] = timer
+            self._heap.append((timer["due"], next(self._seq), key))
+        heapq.heapify(self._heap)
+        self._dirty = False
+
+    def save(self):
+        """Write pending timers if any changed since the last save."""
+        if not self._dirty:
+            return False
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._timers, f)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+        return True
+
+    def _compact(self):
+        # Rebuild the heap from the live timers once stale entries outnumber them
+        if len(self._heap) > 2 * len(self._timers) + 16:
+            self._heap = [(timer["due"], next(self._seq), key) for key, timer in self._timers.items()]
+            heapq.heapify(self._heap)
+
+    def _drop_stale(self):
+        # Entries whose timer was cancelled or rescheduled since they were pushed
+        while self._heap:
+            due, _, key = self._heap[0]
+            timer = self._timers.get(key)
+            if timer is not None and timer["due"] == due:
+                break
+            heapq.heappop(self._heap)
+
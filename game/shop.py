@@ -1,11 +1,15 @@
-# Criar o arquivo shop.py
-cat > game/shop.py << 'EOL'
 import json
+import os
+import threading
 from datetime import datetime, timedelta
-import random
-from PIL import Image, ImageTk
+from game.assets import load_image, load_placeholder
+from game.rng import resolve_rng
 
 class ShopItem:
+    # Saved fields, in constructor order
+    FIELDS = ("id", "name", "description", "cost", "item_type", "rarity", "quantity", "image_path")
+    __slots__ = FIELDS + ("_image",)
+
     def __init__(self, id, name, description, cost, item_type, rarity=None, quantity=1, image_path=None):
         self.id = id
         self.name = name
@@ -14,40 +18,102 @@ class ShopItem:
         self.item_type = item_type  # "card", "chest", "gold", "gems"
         self.rarity = rarity
         self.quantity = quantity
-        self.image = None
         self.image_path = image_path
-        self.load_image()
+        self._image = None
+
+    @property
+    def image(self):
+        # Decoded on first render only; purchases and saves never touch PIL
+        if self._image is None:
+            if self.image_path:
+                self._image = load_image(self.image_path, (150, 200), placeholder_color='gray')
+            else:
+                self._image = load_placeholder((150, 200), 'gray')
+        return self._image
 
     def load_image(self):
-        if self.image_path:
-            try:
-                self.image = Image.open(self.image_path)
-                self.image = self.image.resize((150, 200))
-            except FileNotFoundError:
-                self.image = Image.new('RGB', (150, 200), color='gray')
-        else:
-            self.image = Image.new('RGB', (150, 200), color='gray')
+        self._image = None
+        return self.image
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    @classmethod
+    def from_dict(cls, data):
+        # Unknown keys (e.g. from older shop files) are ignored
+        return cls(**{field: data[field] for field in cls.FIELDS if field in data})
+
+class ShopSnapshot:
+    """One version of the shop catalog with an id -> item index; never changed once published."""
+
+    def __init__(self, version, items, daily_offers, special_offers):
+        self.version = version
+        self.items = tuple(items)
+        self.daily_offers = tuple(daily_offers)
+        self.special_offers = tuple(special_offers)
+        self.index = {}
+        for item in self.items + self.daily_offers + self.special_offers:
+            # Regular items win over offers sharing their id
+            self.index.setdefault(item.id, item)
+
+    def get(self, item_id):
+        return self.index.get(item_id)
 
 class Shop:
-    def __init__(self):
-        self.items = []
-        self.daily_offers = []
-        self.special_offers = []
+    def __init__(self, seed=None, rng=None):
+        # Readers take self.snapshot once and see a whole catalog version;
+        # writers build the next one and swap the reference under the lock
+        self.snapshot = ShopSnapshot(0, (), (), ())
+        self._lock = threading.Lock()
+        # Each rotation draws its own seed from here and records it
+        self.rng = rng
+        self.offers_seed = None
+        self._saved_data = None  # What data/shop.json holds, to skip writes that change nothing
         self.load_shop_data()
-        self.update_offers()
+        # Saved offers are kept; the game's scheduler rotates them daily
+        if seed is not None or not self.snapshot.daily_offers:
+            self.update_offers(seed)
+
+    @property
+    def items(self):
+        return self.snapshot.items
+
+    @property
+    def daily_offers(self):
+        return self.snapshot.daily_offers
+
+    @property
+    def special_offers(self):
+        return self.snapshot.special_offers
+
+    def publish(self, **changes):
+        """Replace any of items, daily_offers and special_offers in one new snapshot."""
+        with self._lock:
+            current = self.snapshot
+            self.snapshot = ShopSnapshot(
+                current.version + 1,
+                changes.get("items", current.items),
+                changes.get("daily_offers", current.daily_offers),
+                changes.get("special_offers", current.special_offers)
+            )
+            return self.snapshot
 
     def load_shop_data(self):
         try:
             with open("data/shop.json", "r") as f:
                 data = json.load(f)
-                self.items = [ShopItem(**item) for item in data.get("items", [])]
-                self.daily_offers = [ShopItem(**offer) for offer in data.get("daily_offers", [])]
-                self.special_offers = [ShopItem(**offer) for offer in data.get("special_offers", [])]
+            self.publish(
+                items=[ShopItem.from_dict(item) for item in data.get("items", [])],
+                daily_offers=[ShopItem.from_dict(offer) for offer in data.get("daily_offers", [])],
+                special_offers=[ShopItem.from_dict(offer) for offer in data.get("special_offers", [])]
+            )
+            self.offers_seed = data.get("offers_seed")
+            self._saved_data = self._shop_data()
         except FileNotFoundError:
             self._create_default_shop()
 
     def _create_default_shop(self):
-        self.items = [
+        items = [
             ShopItem(
                 "gold_1000",
                 "Gold Pack",
@@ -121,21 +187,33 @@ class Shop:
                 image_path="assets/shop/legendary_chest.png"
             )
         ]
-
-        self.save_shop_data()
+        # Saved along with the first offers
+        self.publish(items=items)
 
     def save_shop_data(self):
-        data = {
-            "items": [vars(item) for item in self.items],
-            "daily_offers": [vars(offer) for offer in self.daily_offers],
-            "special_offers": [vars(offer) for offer in self.special_offers]
-        }
-        with open("data/shop.json", "w") as f:
+        """Write data/shop.json if the catalog or offers changed; returns whether it wrote."""
+        data = self._shop_data()
+        if data == self._saved_data:
+            return False
+        tmp_path = "data/shop.json.tmp"
+        with open(tmp_path, "w") as f:
             json.dump(data, f, indent=4)
+        os.replace(tmp_path, "data/shop.json")
+        self._saved_data = data
+        return True
+
+    def _shop_data(self):
+        snapshot = self.snapshot
+        return {
+            "items": [item.to_dict() for item in snapshot.items],
+            "daily_offers": [offer.to_dict() for offer in snapshot.daily_offers],
+            "special_offers": [offer.to_dict() for offer in snapshot.special_offers],
+            "offers_seed": self.offers_seed
+        }
 
-    def update_offers(self):
+    def update_offers(self, seed=None):
         # Update daily offers
-        self.daily_offers = [
+        daily_offers = [
             ShopItem(
                 "daily_chest",
                 "Daily Chest",
@@ -156,9 +234,10 @@ class Shop:
             )
         ]
 
-        # Update special offers (randomly)
-        if random.random() < 0.3:  # 30% chance to have a special offer
-            self.special_offers = [
+        # Update special offers (randomly); the seed is saved so a rotation can be replayed
+        rng, self.offers_seed = resolve_rng(seed, self.rng)
+        if rng.random() < 0.3:  # 30% chance to have a special offer
+            special_offers = [
                 ShopItem(
                     "special_chest",
                     "Special Chest",
@@ -179,12 +258,14 @@ class Shop:
                 )
             ]
         else:
-            self.special_offers = []
+            special_offers = []
 
+        # Both offer lists change together in one snapshot
+        self.publish(daily_offers=daily_offers, special_offers=special_offers)
         self.save_shop_data()
 
     def purchase_item(self, player, item_id):
-        item = next((item for item in self.items + self.daily_offers + self.special_offers if item.id == item_id), None)
+        item = self.snapshot.get(item_id)
         if not item:
             return False, "Item not found"
 
@@ -203,10 +284,11 @@ class Shop:
         return True, "Purchase successful"
 
     def get_available_items(self):
+        snapshot = self.snapshot
         return {
-            "regular": self.items,
-            "daily": self.daily_offers,
-            "special": self.special_offers
+            "regular": snapshot.items,
+            "daily": snapshot.daily_offers,
+            "special": snapshot.special_offers
         }
 
 class MicrotransactionManager:
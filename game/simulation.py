@@ -0,0 +1,139 @@
+"""
+Monte Carlo matchup runner for balance reports.
+
+Trials are sharded across a ProcessPoolExecutor. The parent loads (or creates)
+the card catalog once and hands its definitions to every worker at startup, so
+workers never touch data/cards.json; each plays its shards with Battle. Every
+shard has its own seed stream derived from the run seed, so results do not
+depend on the number of workers. Partial aggregates are streamed back as shards finish.
+"""
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import fields
+
+from game.battle import Battle
+from game.cards import Card, CardDefinition, CardManager
+from game.rng import new_seed
+
+# Per-process card id -> Card, set once by _init_worker
+_catalog = None
+
+
+class SimulatedPlayer:
+    """Just enough of Player for Battle: a name, a deck and no-op rewards."""
+
+    def __init__(self, username, deck):
+        self.username = username
+        self.deck = deck
+
+    def earn_trophies(self, amount):
+        pass
+
+    def earn_gold(self, amount):
+        pass
+
+
+def _catalog_records():
+    # Plain dicts: definitions hold a read-only mapping proxy, which does not pickle
+    records = []
+    for definition in CardManager().definitions.values():
+        record = {field.name: getattr(definition, field.name) for field in fields(CardDefinition)}
+        if record["special_ability"] is not None:
+            record["special_ability"] = dict(record["special_ability"])
+        records.append(record)
+    return records
+
+
+def _init_worker(records):
+    global _catalog
+    _catalog = {}
+    for record in records:
+        definition = CardDefinition(**record)
+        _catalog[definition.id] = Card.from_definition(definition)
+
+
+def _resolve_deck(deck):
+    # Decks travel between processes as card ids; cards themselves stay in the worker
+    return [_catalog[card_id] for card_id in deck]
+
+
+def _run_shard(pair, deck_a, deck_b, trials, shard_seed, max_turns):
+    player_a = SimulatedPlayer("a", _resolve_deck(deck_a))
+    player_b = SimulatedPlayer("b", _resolve_deck(deck_b))
+    rng = random.Random(shard_seed)
+
+    totals = {"battles": 0, "wins": 0, "turns": 0, "health_a": 0, "health_b": 0}
+    for _ in range(trials):
+        battle = Battle(player_a, player_b, max_turns=max_turns, log_limit=0, seed=rng.getrandbits(63))
+        result = battle.start()
+        totals["battles"] += 1
+        totals["wins"] += result["winner"] == "a"
+        totals["turns"] += result["turns"]
+        totals["health_a"] += result["player1_health"]
+        totals["health_b"] += result["player2_health"]
+    return pair, totals
+
+
+def _shards(decks_a, decks_b, trials, shard_size, seed):
+    for i, deck_a in enumerate(decks_a):
+        for j, deck_b in enumerate(decks_b):
+            for shard, start in enumerate(range(0, trials, shard_size)):
+                shard_seed = f"{seed}:{i}:{j}:{shard}"
+                yield (i, j), tuple(deck_a), tuple(deck_b), min(shard_size, trials - start), shard_seed
+
+
+def _summary(totals):
+    battles = totals["battles"]
+    return {
+        "battles": battles,
+        "wins": totals["wins"],
+        "win_rate": totals["wins"] / battles if battles else 0,
+        "mean_turns": totals["turns"] / battles if battles else 0,
+        "mean_health_a": totals["health_a"] / battles if battles else 0,
+        "mean_health_b": totals["health_b"] / battles if battles else 0
+    }
+
+
+def iter_matchups(decks_a, decks_b, trials, workers=None, seed=None, shard_size=1000, max_turns=10):
+    """Yield (pair, summary) each time a shard finishes.
+
+    pair is (index into decks_a, index into decks_b) and summary holds the
+    running aggregate for that matchup so far. Decks are sequences of card ids
+    from data/cards.json. workers=0 runs everything in this process.
+    """
+    if seed is None:
+        seed = new_seed()
+    totals = {}
+    shards = _shards(decks_a, decks_b, trials, shard_size, seed)
+
+    def merge(pair, shard_totals):
+        pair_totals = totals.setdefault(pair, dict.fromkeys(shard_totals, 0))
+        for key, value in shard_totals.items():
+            pair_totals[key] += value
+        return pair, _summary(pair_totals)
+
+    records = _catalog_records()
+    if workers == 0:
+        _init_worker(records)
+        for shard in shards:
+            yield merge(*_run_shard(*shard, max_turns))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(records,)) as executor:
+        futures = [executor.submit(_run_shard, *shard, max_turns) for shard in shards]
+        for future in as_completed(futures):
+            yield merge(*future.result())
+
+
+def simulate_matchups(decks_a, decks_b, trials, workers=None, seed=None, shard_size=1000, max_turns=10,
+                      on_progress=None):
+    """Play trials battles for every (deck_a, deck_b) pair and return {pair: summary}.
+
+    on_progress, if given, is called with (pair, summary) as partial results arrive.
+    """
+    results = {}
+    for pair, summary in iter_matchups(decks_a, decks_b, trials, workers, seed, shard_size, max_turns):
+        results[pair] = summary
+        if on_progress:
+            on_progress(pair, summary)
+    return results
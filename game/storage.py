@@ -0,0 +1,194 @@
+"""
+SQLite-backed player store.
+
+Each player is one row; list and dict fields are stored as JSON text. Only
+players with dirty fields are written, only their changed columns are
+updated, and every flush is a single transaction.
+
+PlayerRegistry puts a dict-like, lazily hydrated LRU of Player objects in
+front of the store.
+"""
+import json
+import os
+import sqlite3
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+from game.player import PERSISTED_FIELDS, Player
+
+# Columns holding JSON-encoded values
+JSON_FIELDS = ("cards", "deck", "chests", "daily_rewards", "achievements", "pity")
+
+
+def _column_type(field):
+    return "TEXT" if field in JSON_FIELDS or field == "last_login" else "INTEGER"
+
+
+class PlayerStore:
+    def __init__(self, path="data/players.db"):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS players (
+                username TEXT PRIMARY KEY,
+                {", ".join(f"{field} {_column_type(field)}" for field in PERSISTED_FIELDS)}
+            )
+        """)
+        # Databases created before a field was added get the new column
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(players)")}
+        for field in PERSISTED_FIELDS:
+            if field not in columns:
+                self.conn.execute(f"ALTER TABLE players ADD COLUMN {field} {_column_type(field)}")
+        self.conn.commit()
+
+    def __contains__(self, username):
+        with self._lock:
+            row = self.conn.execute("SELECT 1 FROM players WHERE username = ?", (username,)).fetchone()
+        return row is not None
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM players").fetchone()[0]
+
+    def usernames(self):
+        with self._lock:
+            return [row[0] for row in self.conn.execute("SELECT username FROM players ORDER BY username")]
+
+    def load(self, username):
+        with self._lock:
+            row = self.conn.execute(
+                f"SELECT {', '.join(PERSISTED_FIELDS)} FROM players WHERE username = ?", (username,)
+            ).fetchone()
+        if row is None:
+            return None
+        record = dict(zip(PERSISTED_FIELDS, row))
+        for field in JSON_FIELDS:
+            if record[field] is not None:
+                record[field] = json.loads(record[field])
+        return Player.from_record(username, record)
+
+    def save(self, players):
+        """Write the dirty fields of the given players in one transaction.
+
+        Returns the number of players written.
+        """
+        updates = []
+        for player in players:
+            if not player.dirty:
+                continue
+            fields = player.take_dirty()
+            # Deck entries point into the card list, so they move together
+            if "cards" in fields:
+                fields.add("deck")
+            fields = [field for field in PERSISTED_FIELDS if field in fields]
+            record = player.to_record(fields)
+            values = [json.dumps(record[field]) if field in JSON_FIELDS else record[field] for field in fields]
+            updates.append((player, fields, values))
+
+        if not updates:
+            return 0
+        with self._lock:
+            try:
+                with self.conn:
+                    for player, fields, values in updates:
+                        self.conn.execute("INSERT OR IGNORE INTO players (username) VALUES (?)", (player.username,))
+                        assignments = ", ".join(f"{field} = ?" for field in fields)
+                        self.conn.execute(f"UPDATE players SET {assignments} WHERE username = ?",
+                                          values + [player.username])
+            except sqlite3.Error:
+                # Nothing was written; keep the fields dirty for the next flush
+                for player, fields, _ in updates:
+                    player.mark_dirty(*fields)
+                raise
+        return len(updates)
+
+    def delete(self, username):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM players WHERE username = ?", (username,))
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+class PlayerRegistry(MutableMapping):
+    """Mapping of username -> Player that loads players from the store on first access.
+
+    At most capacity players are kept hydrated; the least recently used ones are
+    saved (if dirty) and dropped. An evicted player that is still referenced
+    elsewhere, e.g. the player logged into the UI, is handed out again instead
+    of being reloaded, so there is never more than one live object per username.
+    """
+
+    def __init__(self, store, capacity=1000):
+        self.store = store
+        self.capacity = capacity
+        self._players = OrderedDict()
+        self._evicted = weakref.WeakValueDictionary()
+        self._lock = threading.RLock()
+
+    def __getitem__(self, username):
+        with self._lock:
+            player = self._players.get(username)
+            if player is not None:
+                self._players.move_to_end(username)
+                return player
+            player = self._evicted.pop(username, None)
+            if player is None:
+                player = self.store.load(username)
+            if player is None:
+                raise KeyError(username)
+            self._players[username] = player
+            self._evict()
+            return player
+
+    def __setitem__(self, username, player):
+        with self._lock:
+            self.store.save([player])
+            self._evicted.pop(username, None)
+            self._players[username] = player
+            self._players.move_to_end(username)
+            self._evict()
+
+    def __delitem__(self, username):
+        with self._lock:
+            if username not in self:
+                raise KeyError(username)
+            self._players.pop(username, None)
+            self._evicted.pop(username, None)
+            self.store.delete(username)
+
+    def __contains__(self, username):
+        with self._lock:
+            if username in self._players or username in self._evicted:
+                return True
+        return username in self.store
+
+    def __iter__(self):
+        return iter(self.store.usernames())
+
+    def __len__(self):
+        return len(self.store)
+
+    def loaded(self):
+        """Players currently held in memory, hydrated or evicted but still referenced."""
+        with self._lock:
+            return list(self._players.values()) + list(self._evicted.values())
+
+    def flush(self):
+        """Save every in-memory player with pending changes; returns how many were written."""
+        return self.store.save(self.loaded())
+
+    def _evict(self):
+        while len(self._players) > self.capacity:
+            username, player = next(iter(self._players.items()))
+            # Save before dropping, so a failed write keeps the player in memory
+            self.store.save([player])
+            del self._players[username]
+            self._evicted[username] = player
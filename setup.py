@@ -8,5 +8,9 @@ setup(
         "pygame",
         "customtkinter",
         "pillow"
-    ]
+    ],
+    extras_require={
+        # game.batch, the vectorized balance simulator
+        "batch": ["numpy"]
+    }
 ) 
\ No newline at end of file
@@ -0,0 +1,40 @@
+import threading
+
+from game.assets import AssetPreloader, asset_cache, load_image, set_image_backend
+
+
+class FakeBackend:
+    def __init__(self):
+        self.opened = []
+        self.threads = set()
+
+    def open(self, path, size):
+        if "missing" in path:
+            raise FileNotFoundError(path)
+        self.opened.append(path)
+        self.threads.add(threading.current_thread().name)
+        return f"{path}@{size}", 10
+
+    def placeholder(self, size, color):
+        return f"{color}@{size}", 1
+
+
+def test_preloader_decodes_off_thread_and_warms_cache():
+    backend = FakeBackend()
+    set_image_backend(backend)
+    try:
+        loaded = []
+        preloader = AssetPreloader([("a.png", (10, 10)), ("missing.png", (10, 10))],
+                                   on_loaded=lambda path, size, image: loaded.append(path))
+        while not preloader.finished:
+            preloader.poll()
+
+        assert preloader.progress == 1.0
+        assert loaded == ["a.png"]
+        assert threading.current_thread().name not in backend.threads
+        assert load_image("a.png", (10, 10)) == "a.png@(10, 10)"
+        assert load_image("missing.png", (10, 10)) is None
+        assert backend.opened == ["a.png"]
+    finally:
+        set_image_backend(None)
+        asset_cache.clear()
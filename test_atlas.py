@@ -0,0 +1,30 @@
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from ui.atlas import TextureAtlas, _pack, build_atlas
+
+
+def test_pack_spills_onto_new_shelves_and_sheets():
+    placements = _pack([(60, 40)] * 5, (100, 100))
+    assert placements == [(0, 0, 0), (0, 0, 40), (1, 0, 0), (1, 0, 40), (2, 0, 0)]
+
+
+def test_atlas_slices_images_and_detects_changes(tmp_path):
+    cards = tmp_path / "cards"
+    cards.mkdir()
+    for name, color in (("knight", (255, 0, 0, 255)), ("wizard", (0, 0, 255, 255))):
+        Image.new("RGBA", (30, 40), color).save(cards / f"{name}.png")
+    sizes = {str(cards): (15, 20)}
+
+    atlas = build_atlas(str(tmp_path / "atlas"), sizes)
+    wizard = atlas.get(str(cards / "wizard.png"), (15, 20))
+    assert wizard.size == (15, 20)
+    assert wizard.getpixel((7, 10)) == (0, 0, 255, 255)
+    assert atlas.get(str(cards / "wizard.png"), (50, 50)) is None
+    assert len(atlas.sheet_names) == 1
+
+    assert TextureAtlas(str(tmp_path / "atlas")).is_current(sizes)
+    Image.new("RGBA", (30, 40)).save(cards / "dragon.png")
+    assert not TextureAtlas(str(tmp_path / "atlas")).is_current(sizes)
+    assert str(cards / "dragon.png") in TextureAtlas.open_or_build(str(tmp_path / "atlas"), sizes)
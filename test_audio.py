@@ -0,0 +1,53 @@
+import threading
+import time
+
+from game.audio import set_audio_backend, sound_bank
+
+
+class FakeSound:
+    def __init__(self):
+        self.plays = 0
+
+    def play(self):
+        self.plays += 1
+        return object()
+
+
+class SlowBackend:
+    def __init__(self):
+        self.release = threading.Event()
+        self.loads = []
+        self.sound = FakeSound()
+
+    def load(self, path):
+        self.release.wait(5)
+        self.loads.append(path)
+        return self.sound
+
+    def set_channels(self, count):
+        self.channels = count
+
+
+def test_play_does_not_block_and_decodes_once():
+    backend = SlowBackend()
+    set_audio_backend(backend)
+    try:
+        start = time.monotonic()
+        assert sound_bank.play("gold") is False
+        sound_bank.play("gold")
+        assert time.monotonic() - start < 1
+
+        backend.release.set()
+        deadline = time.monotonic() + 5
+        while backend.sound.plays == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert backend.sound.plays == 1
+        assert sound_bank.play("gold") is True
+        assert backend.loads == ["assets/sounds/gold.mp3"]
+        assert backend.channels == sound_bank.channels
+    finally:
+        set_audio_backend(None)
+
+
+def test_no_backend_is_a_no_op():
+    assert sound_bank.play("gold") is False
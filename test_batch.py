@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from game.battle import Battle
+from game.cards import Card, CardRarity, CardType
+from game.player import Player
+
+np = pytest.importorskip("numpy")
+from game.batch import simulate_battles
+
+ABILITIES = [
+    None,
+    {"type": "heal", "value": 60},
+    {"type": "damage", "value": 80},
+    {"type": "buff", "name": "Battle Cry", "duration": 2, "value": 20},
+    {"type": "debuff", "name": "Burning", "duration": 3, "value": 30},
+]
+
+
+def random_deck(rng):
+    return [
+        Card(
+            id=f"c{index}",
+            name=f"Card {index}",
+            rarity=CardRarity.COMMON,
+            type=CardType.TROOP,
+            attack=rng.randint(0, 300),
+            defense=rng.randint(1, 300),
+            cost=rng.randint(1, 8),
+            description="",
+            special_ability=rng.choice(ABILITIES)
+        )
+        for index in range(rng.randint(1, 8))
+    ]
+
+
+def test_batch_matches_scalar_engine():
+    rng = random.Random(7)
+    decks1 = [random_deck(rng) for _ in range(200)]
+    decks2 = [random_deck(rng) for _ in range(200)]
+    seeds = [rng.getrandbits(32) for _ in range(200)]
+
+    batch = simulate_battles(decks1, decks2, seeds, max_turns=15)
+
+    player1 = Player("p1")
+    player2 = Player("p2")
+    for i, seed in enumerate(seeds):
+        player1.deck = decks1[i]
+        player2.deck = decks2[i]
+        result = Battle(player1, player2, max_turns=15, seed=seed).start()
+        assert bool(batch["player1_wins"][i]) == (result["winner"] == "p1")
+        assert batch["player1_health"][i] == result["player1_health"]
+        assert batch["player2_health"][i] == result["player2_health"]
+        assert batch["turns"][i] == result["turns"]
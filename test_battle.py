@@ -0,0 +1,81 @@
+from game.battle import Battle
+from game.cards import Card, CardRarity, CardType
+from game.player import Player
+
+
+def make_card(id, attack, defense, cost, special_ability=None):
+    return Card(
+        id=id,
+        name=id.title(),
+        rarity=CardRarity.COMMON,
+        type=CardType.TROOP,
+        attack=attack,
+        defense=defense,
+        cost=cost,
+        description="",
+        special_ability=special_ability
+    )
+
+
+def make_player(username, cards):
+    player = Player(username)
+    player.cards = list(cards)
+    player.deck = list(cards)
+    return player
+
+
+def test_steps_yields_turns_then_end():
+    player1 = make_player("p1", [make_card("knight", 100, 100, 3), make_card("archer", 120, 60, 3)])
+    player2 = make_player("p2", [make_card("tank", 30, 300, 3)])
+    battle = Battle(player1, player2)
+
+    events = list(battle.steps())
+
+    assert all(event["type"] == "turn" for event in events[:-1])
+    assert events[-1]["type"] == "end"
+    assert events[-1]["result"]["winner"] in ("p1", "p2")
+    assert [event["turn"] for event in events[:-1]] == list(range(1, len(events)))
+
+
+def test_battle_does_not_damage_collection_cards():
+    knight = make_card("knight", 100, 100, 3)
+    player1 = make_player("p1", [knight])
+    player2 = make_player("p2", [make_card("dragon", 200, 150, 5, {"type": "damage", "value": 50})])
+
+    Battle(player1, player2).start()
+
+    assert knight.defense == 100
+
+
+def test_long_battle_does_not_recurse_or_grow_log():
+    player1 = make_player("p1", [make_card("wall", 0, 100, 1)])
+    player2 = make_player("p2", [make_card("wall2", 0, 100, 1)])
+    battle = Battle(player1, player2, max_turns=5000, log_limit=50)
+
+    result = battle.start()
+
+    assert result["turns"] == 5000
+    assert len(result["log"]) == 50
+
+
+def test_same_seed_replays_the_same_battle():
+    cards = [make_card("a", 100, 100, 2), make_card("b", 100, 100, 2), make_card("c", 90, 120, 3)]
+    opponents = [make_card("d", 100, 100, 2), make_card("e", 110, 90, 2)]
+
+    first = Battle(make_player("p1", cards), make_player("p2", opponents), seed=42).start()
+    second = Battle(make_player("p1", cards), make_player("p2", opponents), seed=42).start()
+
+    assert first["seed"] == second["seed"] == 42
+    assert first["log"] == second["log"]
+    assert first["winner"] == second["winner"]
+
+
+def test_start_reports_every_event():
+    player1 = make_player("p1", [make_card("knight", 100, 100, 3)])
+    player2 = make_player("p2", [make_card("tank", 30, 300, 3)])
+    events = []
+
+    result = Battle(player1, player2, seed=7).start(on_event=events.append)
+
+    assert events[-1] == {"type": "end", "turn": result["turns"], "result": events[-1]["result"]}
+    assert len(events) == result["turns"] + 1
@@ -0,0 +1,32 @@
+from game.cards import CardManager, CardRarity, CardType
+
+
+def test_indexes_match_a_scan_of_the_catalog(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = CardManager(seed=1)
+    cards = list(manager.cards.values())
+
+    for rarity in CardRarity:
+        assert list(manager.get_cards_by_rarity(rarity)) == [card for card in cards if card.rarity == rarity]
+    for card_type in CardType:
+        assert list(manager.get_cards_by_type(card_type)) == [card for card in cards if card.type == card_type]
+    for mana in range(11):
+        assert sorted(manager.get_cards_by_max_cost(mana), key=id) == sorted(
+            (card for card in cards if card.cost <= mana), key=id)
+    assert manager.get_random_card(CardRarity.EPIC).rarity == CardRarity.EPIC
+
+
+def test_buffs_and_debuffs_change_defense_each_turn():
+    from game.cards import CardDefinition, CardEffect, CardInstance
+
+    definition = CardDefinition(id="knight", name="Knight", rarity=CardRarity.COMMON, type=CardType.TROOP,
+                                attack=100, defense=100, cost=3, description="")
+    card = CardInstance(definition)
+    card.add_effect(CardEffect("Battle Cry", 2, "buff", 20))
+    card.add_effect(CardEffect("Poison", 1, "debuff", 5))
+
+    card.process_effects()
+    assert card.defense == 115 and [effect.name for effect in card.effects] == ["Battle Cry"]
+    card.process_effects()
+    card.process_effects()
+    assert card.defense == 135 and card.effects == []
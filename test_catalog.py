@@ -0,0 +1,43 @@
+import json
+import os
+
+import pytest
+
+from game.catalog import CardCatalog, CatalogError
+
+KNIGHT = {"id": "knight", "name": "Knight", "rarity": "Common", "type": "Troop", "attack": 100,
+          "defense": 100, "cost": 3, "description": "",
+          "special_ability": {"type": "buff", "name": "Battle Cry", "duration": 2, "value": 20}}
+
+
+def write_cards(path, cards):
+    path.write_text(json.dumps({"cards": cards}))
+
+
+def test_definitions_are_parsed_once_and_shared(tmp_path):
+    path = tmp_path / "initial_deck.json"
+    write_cards(path, [KNIGHT])
+    catalog = CardCatalog()
+
+    first = catalog.definitions(str(path))
+    # Touching the file without changing it keeps the compiled definitions
+    os.utime(path, ns=(0, 0))
+    assert catalog.definitions(str(path)) is first
+    assert first[0].special_ability["value"] == 20
+
+    write_cards(path, [dict(KNIGHT, attack=120)])
+    assert catalog.definitions(str(path))[0].attack == 120
+
+
+@pytest.mark.parametrize("change", [
+    {"rarity": "Mythic"},
+    {"special_ability": {"type": "buff", "value": 20}},
+    {"special_ability": {"type": "debuff", "name": "Burn", "duration": "2", "value": 5}},
+    {"special_ability": {"type": "heal"}},
+    {"special_ability": {"type": "teleport", "value": 1}}
+])
+def test_invalid_card_is_rejected(tmp_path, change):
+    path = tmp_path / "cards.json"
+    write_cards(path, [dict(KNIGHT, **change)])
+    with pytest.raises(CatalogError):
+        CardCatalog().definitions(str(path))
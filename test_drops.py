@@ -0,0 +1,65 @@
+import random
+from collections import Counter
+from datetime import datetime
+
+import pytest
+
+from game.cards import CardManager, CardRarity
+from game.drops import AliasTable, DropEngine, DropTable
+from game.player import Player
+
+
+def test_alias_table_matches_weights():
+    table = AliasTable(["a", "b", "c"], [1, 2, 7])
+    rng = random.Random(3)
+    counts = Counter(table.sample(rng) for _ in range(100000))
+    assert abs(counts["a"] / 100000 - 0.1) < 0.01
+    assert abs(counts["c"] / 100000 - 0.7) < 0.01
+
+
+def test_guaranteed_slots_and_pity():
+    table = DropTable("test", {CardRarity.COMMON: 1000, CardRarity.EPIC: 1}, cards=3,
+                      guaranteed={CardRarity.RARE: 1}, pity={CardRarity.EPIC: 5})
+    rng = random.Random(1)
+    pity = {}
+    chests = [table.draw_rarities(rng, pity) for _ in range(4)]
+
+    # Nothing has Rare weight, so the guaranteed slot is Epic or better
+    assert all(chest[0] == CardRarity.EPIC for chest in chests)
+    assert pity["test"]["Epic"] == 2
+
+    single = DropTable("single", {CardRarity.COMMON: 1000000, CardRarity.EPIC: 1}, pity={CardRarity.EPIC: 5})
+    draws = [single.draw_rarities(rng, pity)[0] for _ in range(10)]
+    assert [i for i, rarity in enumerate(draws) if rarity == CardRarity.EPIC] == [4, 9]
+
+
+def test_player_opens_unlocked_chest(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    drops = DropEngine(CardManager(), seed=5)
+    player = Player("alice")
+    before = len(player.cards)
+    player.add_chest("Rare", datetime(2000, 1, 1))
+    player.add_chest("Silver Chest", datetime(2999, 1, 1))
+
+    cards = player.open_chest(0, drops)
+
+    assert len(cards) == 2 and len(player.cards) == before + 2
+    assert player.open_chest(0, drops) is None
+    assert len(drops.open_many("Common", 10)) == 10
+
+
+def test_failed_open_keeps_the_chest(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    drops = DropEngine(CardManager(), seed=5)
+    player = Player("alice")
+    player.add_chest("Mystery Chest", datetime(2000, 1, 1))
+    player.add_chest("Common", datetime(2000, 1, 1))
+    player.take_dirty()
+
+    with pytest.raises(KeyError):
+        player.open_chest(0, drops)
+
+    assert [chest["type"] for chest in player.chests] == ["Mystery Chest", "Common"]
+    assert player.pity == {} and not player.dirty
+    assert len(player.open_chest(1, drops)) == 3
+    assert player.pity["Common"]
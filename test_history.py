@@ -0,0 +1,88 @@
+import json
+
+from game.history import BattleHistoryStore, PlayerStatsIndex
+
+
+def record(i):
+    return {"player1": "a", "player2": "b", "winner": "a", "turns": i}
+
+
+def test_appends_survive_reopen_and_rotation(tmp_path):
+    store = BattleHistoryStore(str(tmp_path / "history"), segment_size=3)
+    for i in range(7):
+        store.append(record(i))
+    store.close()
+
+    reopened = BattleHistoryStore(str(tmp_path / "history"), segment_size=3)
+
+    assert len(reopened.segments) == 2
+    assert len(reopened) == 7
+    assert [r["turns"] for r in reopened] == list(range(7))
+
+
+def test_compact_keeps_last_records(tmp_path):
+    store = BattleHistoryStore(str(tmp_path / "history"), segment_size=2)
+    for i in range(5):
+        store.append(record(i))
+
+    store.compact(keep_last=3)
+
+    assert [r["turns"] for r in store] == [2, 3, 4]
+    store.append(record(5))
+    assert [r["turns"] for r in BattleHistoryStore(str(tmp_path / "history"))] == [2, 3, 4, 5]
+
+
+def test_migrates_legacy_history_file(tmp_path):
+    legacy = tmp_path / "history.json"
+    legacy.write_text(json.dumps([record(0), record(1)]))
+
+    store = BattleHistoryStore(str(tmp_path / "history"))
+
+    assert [r["turns"] for r in store] == [0, 1]
+    assert not legacy.exists()
+
+
+def battle(i, winner):
+    return {"player1": "a", "player2": "b", "winner": winner, "turns": i,
+            "player1_health": 1000 - i, "player2_health": 10 * i}
+
+
+def test_stats_index_catches_up_after_reopen(tmp_path):
+    directory = str(tmp_path / "history")
+    store = BattleHistoryStore(directory)
+    stats = PlayerStatsIndex(store, recent_size=2, save_every=1000)
+    for i in range(3):
+        store.append(battle(i, "a"))
+        stats.record(battle(i, "a"))
+    stats.save()
+    # Recorded after the last stats save
+    store.append(battle(3, "b"))
+    store.close()
+
+    reopened = PlayerStatsIndex(BattleHistoryStore(directory), recent_size=2)
+
+    assert reopened.seq == 4
+    assert reopened.get("a")["battles"] == 4
+    assert reopened.get("a")["wins"] == 3
+    assert reopened.get("b")["damage"] == sum(1000 - i for i in range(4))
+    assert [r["turns"] for r in reopened.recent("a")] == [2, 3]
+    assert reopened.top(1) == ["a"]
+
+
+def test_stats_survive_compaction(tmp_path):
+    directory = str(tmp_path / "history")
+    store = BattleHistoryStore(directory, segment_size=2)
+    stats = PlayerStatsIndex(store, save_every=1000)
+    for i in range(5):
+        store.append(battle(i, "a"))
+        stats.record(battle(i, "a"))
+    store.append(battle(5, "b"))  # Not folded in yet
+
+    stats.compact(keep_last=2)
+    store.append(battle(6, "b"))
+    store.close()
+
+    reopened = PlayerStatsIndex(BattleHistoryStore(directory, segment_size=2))
+    assert reopened.history.base == 4
+    assert reopened.seq == 7
+    assert (reopened.get("a")["battles"], reopened.get("a")["wins"]) == (7, 5)
@@ -0,0 +1,73 @@
+from datetime import datetime
+
+from game.game import Game
+from game.scheduler import Scheduler
+from game.storage import PlayerStore
+
+
+def test_timers_fire_in_order_and_survive_restart(tmp_path):
+    path = str(tmp_path / "schedule.json")
+    scheduler = Scheduler(path)
+    scheduler.schedule("ping", 30, "late")
+    scheduler.schedule("ping", 10, "early")
+    scheduler.schedule("ping", 20, "cancelled", key="c")
+    scheduler.cancel("c")
+    scheduler.schedule("ping", 5, "daily", key="d", interval=100)
+    scheduler.save()
+
+    restarted = Scheduler(path)
+    fired = []
+    restarted.register("ping", lambda payload, due: fired.append(payload))
+    assert restarted.run_due(now=25) == 2
+    assert fired == ["daily", "early"]
+    # Missed periods of a repeating timer fire once
+    assert restarted.run_due(now=1000) == 2
+    assert fired[2:] == ["late", "daily"]
+    assert restarted.next_due() == 1005
+
+
+def test_cancelled_timers_do_not_grow_the_heap(tmp_path):
+    scheduler = Scheduler(str(tmp_path / "schedule.json"))
+    scheduler.schedule("ping", 50, key="kept")
+    for i in range(1000):
+        scheduler.cancel(scheduler.schedule("ping", i))
+
+    assert len(scheduler) == 1
+    assert len(scheduler._heap) <= 2 * len(scheduler) + 17
+    assert scheduler.next_due() == 50
+
+
+def test_game_unlocks_chests_and_grants_rewards(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    game = Game(store=PlayerStore(str(tmp_path / "players.db")))
+    game.add_player("alice")
+    alice = game.players["alice"]
+    game.add_chest("alice", "Rare", datetime(2000, 1, 1))
+    game.add_chest("alice", "Rare", datetime(2999, 1, 1))
+    game.grant_reward("alice", datetime(2000, 1, 2), gems=50)
+    gems = alice.gems
+
+    game.tick(now=datetime(2001, 1, 1))
+
+    assert [chest["unlocked"] for chest in alice.chests] == [True, False]
+    assert alice.gems == gems + 50
+    assert len(Scheduler("data/schedule.json")) == 2  # Second chest and the offer rotation
+
+    assert game.purchase_item("alice", "common_chest")[0]
+    assert f"chest:alice:{alice.chests[-1]['id']}" in game.scheduler
+
+
+def test_auto_keys_do_not_collide_across_restarts(tmp_path):
+    path = str(tmp_path / "schedule.json")
+    scheduler = Scheduler(path)
+    first = [scheduler.schedule("reward", 100, i) for i in range(3)]
+    scheduler.save()
+
+    restarted = Scheduler(path)
+    second = [restarted.schedule("reward", 100, i + 3) for i in range(3)]
+
+    assert len(set(first + second)) == 6 and len(restarted) == 6
+    fired = []
+    restarted.register("reward", lambda payload, due: fired.append(payload))
+    restarted.run_due(now=100)
+    assert sorted(fired) == list(range(6))
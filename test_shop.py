@@ -0,0 +1,41 @@
+from game.player import Player
+from game.shop import Shop
+
+
+def test_rotation_publishes_a_new_snapshot(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    shop = Shop(seed=1)
+    before = shop.snapshot
+
+    shop.update_offers(seed=2)
+
+    assert shop.snapshot.version == before.version + 1
+    assert before.get("daily_gold") is not shop.snapshot.get("daily_gold")
+    assert set(shop.snapshot.index) >= {"gold_1000", "legendary_chest", "daily_chest"}
+
+
+def test_purchase_item_by_id(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    shop = Shop(seed=1)
+    player = Player("alice")
+    player.gems = 150
+
+    assert shop.purchase_item(player, "missing") == (False, "Item not found")
+    assert shop.purchase_item(player, "gems_100")[0]
+    assert player.gems == 150
+
+
+def test_shop_file_written_only_on_change(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    shop = Shop(seed=1)
+    shop_file = tmp_path / "data" / "shop.json"
+    written = shop_file.stat().st_mtime_ns
+
+    reopened = Shop()
+    assert not reopened.save_shop_data()
+    assert shop_file.stat().st_mtime_ns == written
+    assert [offer.to_dict() for offer in reopened.daily_offers] == [offer.to_dict() for offer in shop.daily_offers]
+    assert not hasattr(reopened.items[0], "__dict__")
@@ -0,0 +1,14 @@
+from game.simulation import simulate_matchups
+
+
+def test_results_do_not_depend_on_workers(tmp_path, monkeypatch):
+    # No data/cards.json yet: the parent creates it before any worker starts
+    monkeypatch.chdir(tmp_path)
+    decks_a = [["knight", "archer"], ["wizard"]]
+    decks_b = [["knight", "wizard", "archer"]]
+
+    in_process = simulate_matchups(decks_a, decks_b, 50, workers=0, seed=7, shard_size=20)
+    pooled = simulate_matchups(decks_a, decks_b, 50, workers=2, seed=7, shard_size=20)
+
+    assert pooled == in_process
+    assert in_process[(0, 0)]["battles"] == 50
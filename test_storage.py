@@ -0,0 +1,112 @@
+import json
+import sqlite3
+from datetime import datetime
+
+from game.cards import Card, CardManager
+from game.game import Game
+from game.player import Player
+from game.storage import PlayerRegistry, PlayerStore
+
+
+def test_player_round_trip(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    catalog = CardManager()  # Writes the default data/cards.json
+    store = PlayerStore(str(tmp_path / "players.db"))
+    player = Player("alice")
+    card = Card.from_definition(catalog.get_definition("knight"))
+    card.attack += 15
+    player.add_card(card)
+    player.add_to_deck(card)
+    player.add_chest("Epic", datetime(2030, 1, 1))
+    player.earn_gold(5)
+
+    assert store.save([player]) == 1
+    loaded = store.load("alice")
+
+    assert loaded.gold == player.gold
+    assert [c.name for c in loaded.deck][-1] == "Knight"
+    assert loaded.deck[-1] is loaded.cards[-1]
+    # Shared definition from the catalog, progression from the save
+    assert loaded.cards[-1].definition is catalog.get_definition("knight")
+    assert loaded.cards[-1].attack == card.attack
+    assert loaded.chests[0]["unlock_time"] == datetime(2030, 1, 1)
+    assert not loaded.dirty
+
+
+def test_new_player_keeps_starter_deck_after_reload(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    game = Game(store=PlayerStore(str(tmp_path / "players.db")))
+    game.add_player("alice")  # What login does for a new name
+    game.save_game_data()
+    alice = game.players["alice"]
+
+    loaded = PlayerStore(str(tmp_path / "players.db")).load("alice")
+
+    assert alice.cards and [c.id for c in loaded.deck] == [c.id for c in alice.deck]
+    assert [c.definition for c in loaded.cards] == [c.definition for c in alice.cards]
+    assert loaded.missing_cards == []
+
+
+def test_cards_missing_from_catalog_are_kept(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    catalog = CardManager()
+    store = PlayerStore(str(tmp_path / "players.db"))
+    player = Player("alice")
+    for card_id in ("knight", "wizard"):
+        card = Card.from_definition(catalog.get_definition(card_id))
+        player.add_card(card)
+        player.add_to_deck(card)
+    store.save([player])
+    with sqlite3.connect(str(tmp_path / "players.db")) as conn:
+        cards = json.loads(conn.execute("SELECT cards FROM players").fetchone()[0])
+        cards[-2]["id"] = "retired"
+        conn.execute("UPDATE players SET cards = ?", (json.dumps(cards),))
+
+    loaded = store.load("alice")
+
+    assert [c.id for c in loaded.deck][-1] == "wizard"
+    assert "knight" not in [c.id for c in loaded.cards]
+    assert [c["id"] for c in loaded.missing_cards] == ["retired"]
+    loaded.mark_dirty("cards", "deck")
+    store.save([loaded])
+    assert [c["id"] for c in store.load("alice").missing_cards] == ["retired"]
+
+
+def test_only_dirty_players_are_saved(tmp_path):
+    store = PlayerStore(str(tmp_path / "players.db"))
+    alice = Player("alice")
+    bob = Player("bob")
+    store.save([alice, bob])
+
+    bob.earn_trophies(30)
+
+    assert store.save([alice, bob]) == 1
+    assert store.load("bob").trophies == 30
+    assert store.save([alice, bob]) == 0
+
+
+def test_registry_hydrates_lazily_and_saves_evicted_players(tmp_path):
+    store = PlayerStore(str(tmp_path / "players.db"))
+    store.save(Player(name) for name in ("a", "b", "c"))
+    registry = PlayerRegistry(store, capacity=1)
+
+    registry["a"].earn_gold(10)
+    registry["b"]  # evicts "a"
+
+    assert store.load("a").gold == 1010
+    assert "c" in registry
+    assert sorted(registry) == ["a", "b", "c"]
+
+
+def test_registry_reuses_evicted_player_still_in_use(tmp_path):
+    store = PlayerStore(str(tmp_path / "players.db"))
+    store.save(Player(name) for name in ("a", "b"))
+    registry = PlayerRegistry(store, capacity=1)
+
+    current = registry["a"]
+    registry["b"]
+    current.earn_gems(5)
+
+    assert registry["a"] is current
+    assert registry.flush() == 1
+    assert store.load("a").gems == current.gems
@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from ui.thumbnails import ThumbnailCache
+
+
+def test_variant_is_built_once_and_reused(tmp_path, monkeypatch):
+    source = tmp_path / "knight.png"
+    Image.new("RGBA", (300, 400), (255, 0, 0, 255)).save(source)
+    cache = ThumbnailCache(str(tmp_path / "thumbs"))
+
+    built = cache.load(str(source), (150, 200))
+    assert built.size == (150, 200)
+
+    # A fresh cache reads the raw variant without opening the PNG
+    monkeypatch.setattr(Image, "open", lambda *args: pytest.fail("source decoded again"))
+    reloaded = ThumbnailCache(str(tmp_path / "thumbs")).load(str(source), (150, 200))
+    assert reloaded.tobytes() == built.tobytes()
+
+
+def test_missing_source_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        ThumbnailCache(str(tmp_path / "thumbs")).load(str(tmp_path / "nope.png"), (50, 50))
+
+
+def test_asset_directories_exist():
+    from ui.thumbnails import ASSET_SIZES
+
+    root = os.path.dirname(os.path.abspath(__file__))
+    assert [d for d in ASSET_SIZES if not os.path.isdir(os.path.join(root, d))] == []
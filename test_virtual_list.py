@@ -0,0 +1,15 @@
+import pytest
+
+pytest.importorskip("customtkinter")
+
+from ui.virtual_list import visible_range
+
+
+def test_visible_range_covers_viewport_plus_overscan():
+    # 100px rows, viewport showing rows 10..14 (the last one partially)
+    assert visible_range(1000, 100, 1000, 450, 2) == (8, 17)
+
+
+def test_visible_range_is_clamped_to_items():
+    assert visible_range(3, 100, 0, 800, 2) == (0, 3)
+    assert visible_range(0, 100, 0, 800, 2) == (0, 0)
@@ -0,0 +1,98 @@
+"""
+Rendering and audio adapter between the headless game core and the desktop UI.
+
+Importing this module pulls in PIL, customtkinter and pygame; the core package
+(game.cards, game.player, game.battle, game.shop, game.game) never does.
+"""
+import threading
+
+from PIL import Image
+import customtkinter as ctk
+import pygame
+
+from game.assets import set_image_backend
+from game.audio import set_audio_backend
+from ui.atlas import TextureAtlas
+from ui.thumbnails import ThumbnailCache
+
+
+def _image_bytes(image):
+    width, height = image.size
+    return width * height * len(image.getbands())
+
+
+class CTkImageBackend:
+    """Decodes images with PIL and wraps them in CTkImage for the UI.
+
+    With a ThumbnailCache, images come from its pre-resized variants instead,
+    and images packed in a TextureAtlas are sliced out of its sheets. The atlas
+    can be attached later by load_atlas() while images are already being served.
+    """
+
+    def __init__(self, thumbnails=None, atlas=None):
+        self.thumbnails = thumbnails
+        self.atlas = atlas
+
+    def open(self, path, size):
+        image = self._decode(path, size)
+        return ctk.CTkImage(image, size=size), _image_bytes(image)
+
+    def load_atlas(self, thumbnails=None):
+        """Open, validate or rebuild the texture atlas and start using it; meant for a background thread."""
+        try:
+            atlas = TextureAtlas.open_or_build(thumbnails=thumbnails)
+        except Exception as e:
+            print(f"Texture atlas unavailable, using thumbnails: {str(e)}")
+            return None
+        self.atlas = atlas
+        return atlas
+
+    def _decode(self, path, size):
+        atlas = self.atlas
+        if atlas is not None:
+            image = atlas.get(path, size)
+            if image is not None:
+                return image
+        if self.thumbnails is not None:
+            return self.thumbnails.load(path, size)
+        return Image.open(path).resize(size)
+
+    def placeholder(self, size, color):
+        image = Image.new('RGB', size, color=color)
+        return ctk.CTkImage(image, size=size), _image_bytes(image)
+
+
+class PygameAudioBackend:
+    """Decodes sounds with pygame.mixer; game.audio's sound bank does the playing."""
+
+    def __init__(self):
+        self.available = True
+        try:
+            pygame.mixer.init()
+        except pygame.error:
+            self.available = False
+            print("Warning: Sound system initialization failed. Game will run without sound.")
+
+    def load(self, path):
+        if not self.available:
+            return None
+        try:
+            return pygame.mixer.Sound(path)
+        except (FileNotFoundError, pygame.error):
+            return None
+
+    def set_channels(self, count):
+        if self.available:
+            pygame.mixer.set_num_channels(count)
+
+
+def install():
+    """Plug the customtkinter/pygame backends into the game core."""
+    thumbnails = ThumbnailCache()
+    backend = CTkImageBackend(thumbnails)
+    set_image_backend(backend)
+    set_audio_backend(PygameAudioBackend())
+    # Checking the atlas stats every source and rebuilding it decodes them all, so it
+    # happens off the Tk thread; until it is ready images come from the thumbnails.
+    # `python -m ui.atlas` builds it ahead of time.
+    threading.Thread(target=backend.load_atlas, args=(thumbnails,), name="atlas-load", daemon=True).start()
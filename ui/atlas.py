@@ -0,0 +1,160 @@
+"""
+Texture atlases for card and effect art.
+
+build_atlas() pastes the resized images from the atlas directories into one or
+a few large sheets and writes a JSON index of where each image sits. At run
+time TextureAtlas decodes each sheet once and slices images out of it, instead
+of opening and decoding every card PNG separately.
+
+Run `python -m ui.atlas` from the game directory to build it ahead of time.
+"""
+import json
+import os
+import threading
+
+from PIL import Image
+
+# Directories packed into the atlas and the size their images are shown at
+ATLAS_SIZES = {
+    "assets/cards": (150, 200),
+    "assets/effects": (50, 50)
+}
+
+SHEET_SIZE = (2048, 2048)
+INDEX_FILE = "index.json"
+
+
+def _pack(sizes, sheet_size):
+    """Shelf-pack (width, height) boxes; returns (sheet, x, y) for each, in input order."""
+    order = sorted(range(len(sizes)), key=lambda i: sizes[i][1], reverse=True)
+    placements = [None] * len(sizes)
+    sheet, x, y, shelf_height = 0, 0, 0, 0
+    for i in order:
+        width, height = sizes[i]
+        if width > sheet_size[0] or height > sheet_size[1]:
+            raise ValueError(f"{width}x{height} image does not fit in a {sheet_size[0]}x{sheet_size[1]} sheet")
+        if x + width > sheet_size[0]:
+            # Next shelf
+            x, y, shelf_height = 0, y + shelf_height, 0
+        if y + height > sheet_size[1]:
+            # Next sheet
+            sheet, x, y, shelf_height = sheet + 1, 0, 0, 0
+        placements[i] = (sheet, x, y)
+        x += width
+        shelf_height = max(shelf_height, height)
+    return placements
+
+
+def _sources(asset_sizes):
+    for directory, size in asset_sizes.items():
+        if not os.path.isdir(directory):
+            print(f"Atlas: asset directory {directory} not found, skipped")
+            continue
+        for name in sorted(os.listdir(directory)):
+            if name.lower().endswith(".png"):
+                yield os.path.join(directory, name), tuple(size)
+
+
+def build_atlas(directory="cache/atlas", asset_sizes=ATLAS_SIZES, thumbnails=None, sheet_size=SHEET_SIZE):
+    """Pack every image under asset_sizes into sheets in directory and return the TextureAtlas.
+
+    Images are resized through thumbnails (a ui.thumbnails.ThumbnailCache) when given.
+    """
+    os.makedirs(directory, exist_ok=True)
+    sources = list(_sources(asset_sizes))
+    images = []
+    for path, size in sources:
+        image = thumbnails.load(path, size) if thumbnails is not None else Image.open(path).resize(size)
+        images.append(image.convert("RGBA"))
+
+    placements = _pack([image.size for image in images], sheet_size)
+    sheet_count = max((sheet for sheet, _, _ in placements), default=-1) + 1
+    sheets = [Image.new("RGBA", sheet_size, (0, 0, 0, 0)) for _ in range(sheet_count)]
+    entries = {}
+    for (path, size), image, (sheet, x, y) in zip(sources, images, placements):
+        sheets[sheet].paste(image, (x, y))
+        stat = os.stat(path)
+        entries[path] = {
+            "sheet": sheet,
+            "rect": [x, y, size[0], size[1]],
+            "mtime_ns": stat.st_mtime_ns,
+            "bytes": stat.st_size
+        }
+
+    names = []
+    for number, sheet in enumerate(sheets):
+        name = f"sheet-{number}.png"
+        tmp_path = os.path.join(directory, f"{name}.tmp")
+        sheet.save(tmp_path, format="PNG", compress_level=1)
+        os.replace(tmp_path, os.path.join(directory, name))
+        names.append(name)
+
+    tmp_path = os.path.join(directory, f"{INDEX_FILE}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump({"sheets": names, "entries": entries}, f)
+    os.replace(tmp_path, os.path.join(directory, INDEX_FILE))
+    return TextureAtlas(directory)
+
+
+class TextureAtlas:
+    """Read side of an atlas built by build_atlas(); sheets are decoded on first use and kept in memory."""
+
+    def __init__(self, directory="cache/atlas"):
+        self.directory = directory
+        with open(os.path.join(directory, INDEX_FILE), "r") as f:
+            index = json.load(f)
+        self.sheet_names = index["sheets"]
+        self.entries = index["entries"]
+        self._sheets = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open_or_build(cls, directory="cache/atlas", asset_sizes=ATLAS_SIZES, thumbnails=None):
+        """Open the atlas in directory, rebuilding it if it is missing or any source changed."""
+        try:
+            atlas = cls(directory)
+            if atlas.is_current(asset_sizes):
+                return atlas
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            pass
+        return build_atlas(directory, asset_sizes, thumbnails)
+
+    def is_current(self, asset_sizes=ATLAS_SIZES):
+        sources = dict(_sources(asset_sizes))
+        if sources.keys() != self.entries.keys():
+            return False
+        for path, size in sources.items():
+            entry = self.entries[path]
+            stat = os.stat(path)
+            if (entry["mtime_ns"], entry["bytes"], tuple(entry["rect"][2:])) != (stat.st_mtime_ns, stat.st_size, size):
+                return False
+        return True
+
+    def __contains__(self, path):
+        return path in self.entries
+
+    def get(self, path, size):
+        """The image for path cut out of its sheet, or None if the atlas has no such image at that size."""
+        entry = self.entries.get(path)
+        if entry is None:
+            return None
+        x, y, width, height = entry["rect"]
+        if (width, height) != tuple(size):
+            return None
+        return self._sheet(entry["sheet"]).crop((x, y, x + width, y + height))
+
+    def _sheet(self, number):
+        with self._lock:
+            sheet = self._sheets.get(number)
+            if sheet is None:
+                sheet = Image.open(os.path.join(self.directory, self.sheet_names[number]))
+                sheet.load()
+                self._sheets[number] = sheet
+            return sheet
+
+
+if __name__ == "__main__":
+    from ui.thumbnails import ThumbnailCache
+
+    atlas = TextureAtlas.open_or_build(thumbnails=ThumbnailCache())
+    print(f"{len(atlas.entries)} images in {len(atlas.sheet_names)} atlas sheets")
@@ -0,0 +1,122 @@
+"""
+On-disk cache of pre-resized images.
+
+Each (source image, target size) pair is resized once and stored as a raw pixel
+buffer named after the source's SHA-256 and the size. Later launches read the
+buffer back with Image.frombytes, which skips PNG decoding and resampling. A
+manifest remembers each source's mtime, size and hash, so unchanged sources are
+not even re-hashed.
+
+Run `python -m ui.thumbnails` from the game directory to build every variant
+ahead of time; anything missing is also built on first use.
+"""
+import hashlib
+import json
+import os
+import threading
+
+from PIL import Image
+
+# Asset directories and the size each one is displayed at
+ASSET_SIZES = {
+    "assets/backgrounds": (1200, 800),
+    "assets/cards": (150, 200),
+    "assets/avatars": (100, 100),
+    "assets/chests": (200, 200),
+    "assets/effects": (50, 50)
+}
+
+MANIFEST_FILE = "manifest.json"
+STORED_MODES = ("RGB", "RGBA", "L")
+
+
+class ThumbnailCache:
+    def __init__(self, directory="cache/thumbnails"):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, MANIFEST_FILE)
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        try:
+            with open(self.manifest_path, "r") as f:
+                self.manifest = json.load(f)  # source path -> {"mtime_ns", "size", "hash", "variants"}
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.manifest = {}
+
+    def load(self, path, size):
+        """Return path resized to size as a PIL image, building the cached variant if needed.
+
+        Raises FileNotFoundError if the source image does not exist.
+        """
+        size = tuple(size)
+        entry = self._source_entry(path)
+        key = f"{size[0]}x{size[1]}"
+        mode = entry["variants"].get(key)
+        if mode is not None:
+            try:
+                with open(self._variant_path(entry["hash"], key), "rb") as f:
+                    return Image.frombytes(mode, size, f.read())
+            except (FileNotFoundError, ValueError):
+                pass  # Deleted or truncated variant; build it again
+
+        image = Image.open(path).resize(size)
+        if image.mode not in STORED_MODES:
+            image = image.convert("RGBA")
+        variant_path = self._variant_path(entry["hash"], key)
+        # Preloader threads may build the same variant at once; each writes its own temp file
+        tmp_path = f"{variant_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(image.tobytes())
+        os.replace(tmp_path, variant_path)
+        with self._lock:
+            entry["variants"][key] = image.mode
+            self._save_manifest()
+        return image
+
+    def build(self, asset_sizes=ASSET_SIZES):
+        """Pre-build the variant of every image under the given directories; returns how many were processed."""
+        count = 0
+        for directory, size in asset_sizes.items():
+            if not os.path.isdir(directory):
+                print(f"Thumbnails: asset directory {directory} not found, skipped")
+                continue
+            for name in sorted(os.listdir(directory)):
+                if name.lower().endswith((".png", ".jpg")):
+                    self.load(os.path.join(directory, name), size)
+                    count += 1
+        return count
+
+    def _source_entry(self, path):
+        stat = os.stat(path)
+        with self._lock:
+            entry = self.manifest.get(path)
+            if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                return entry
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        with self._lock:
+            entry = self.manifest.get(path)
+            # Same content under a new mtime keeps its variants
+            variants = entry["variants"] if entry and entry["hash"] == digest else {}
+            entry = self.manifest[path] = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "hash": digest,
+                "variants": variants
+            }
+            self._save_manifest()
+            return entry
+
+    def _variant_path(self, digest, key):
+        return os.path.join(self.directory, f"{digest}-{key}.raw")
+
+    def _save_manifest(self):
+        # Caller holds the lock
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+
+
+if __name__ == "__main__":
+    built = ThumbnailCache().build()
+    print(f"{built} thumbnails up to date")
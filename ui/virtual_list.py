@@ -0,0 +1,120 @@
+"""
+Virtualized list widget.
+
+Only the rows in view, plus a few above and below, exist as widgets. Rows are
+fixed height and recycled while scrolling: the row showing item i is pool slot
+i % pool size, so scrolling by one row rebinds a single widget.
+"""
+import tkinter
+
+import customtkinter as ctk
+
+
+def visible_range(count, row_height, offset, height, overscan):
+    """Indexes [start, end) of the items to render for a viewport at offset pixels."""
+    first = offset // row_height
+    last = (offset + height + row_height - 1) // row_height
+    return max(0, first - overscan), min(count, last + overscan)
+
+
+class VirtualList(ctk.CTkFrame):
+    """Scrollable list that renders items through a small pool of recycled row widgets.
+
+    create_row(parent, height) builds an empty row widget of the given height,
+    and bind_row(row, item) fills it in for an item. Items are matched by identity.
+    """
+
+    def __init__(self, master, row_height, create_row, bind_row, overscan=2, **kwargs):
+        kwargs.setdefault("fg_color", "transparent")
+        super().__init__(master, **kwargs)
+        self.row_height = row_height
+        self.create_row = create_row
+        self.bind_row = bind_row
+        self.overscan = overscan
+        self.items = []
+        self.offset = 0
+        self._rows = []
+        self._bound = {}  # pool slot -> item shown in it
+
+        self.viewport = ctk.CTkFrame(self, fg_color="transparent")
+        self.viewport.pack(side="left", fill="both", expand=True)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.viewport.bind("<Configure>", lambda event: self.refresh())
+        self._route_wheel(self.viewport)
+
+    def set_items(self, items):
+        self.items = list(items)
+        self.refresh()
+
+    def insert(self, index, item):
+        self.items.insert(index, item)
+        self.refresh()
+
+    def append(self, item):
+        self.insert(len(self.items), item)
+
+    def remove(self, item):
+        index = next(i for i, shown in enumerate(self.items) if shown is item)
+        del self.items[index]
+        self.refresh()
+
+    def scroll_to(self, offset):
+        self.offset = offset
+        self.refresh()
+
+    def refresh(self):
+        height = self.viewport.winfo_height()
+        total = len(self.items) * self.row_height
+        self.offset = max(0, min(self.offset, total - height))
+        start, end = visible_range(len(self.items), self.row_height, self.offset, height, self.overscan)
+
+        pool_size = height // self.row_height + 2 + 2 * self.overscan
+        if len(self._rows) < pool_size:
+            for _ in range(pool_size - len(self._rows)):
+                row = self.create_row(self.viewport, self.row_height)
+                self._route_wheel(row)
+                self._rows.append(row)
+            self._bound.clear()  # Slot assignment changes with the pool size
+
+        shown = set()
+        for index in range(start, end):
+            slot = index % len(self._rows)
+            row = self._rows[slot]
+            item = self.items[index]
+            if self._bound.get(slot) is not item:
+                self.bind_row(row, item)
+                self._bound[slot] = item
+            row.place(x=0, y=index * self.row_height - self.offset, relwidth=1)
+            shown.add(slot)
+        for slot, row in enumerate(self._rows):
+            if slot not in shown:
+                row.place_forget()
+                self._bound.pop(slot, None)
+
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + height) / total))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _on_scrollbar(self, action, value, unit=None):
+        page = self.viewport.winfo_height()
+        if action == "moveto":
+            self.scroll_to(int(float(value) * len(self.items) * self.row_height))
+        elif unit == "pages":
+            self.scroll_to(self.offset + int(value) * page)
+        else:
+            self.scroll_to(self.offset + int(value) * self.row_height)
+
+    def _on_wheel(self, event):
+        # Button-4/5 on X11, signed delta elsewhere
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+        self.scroll_to(self.offset + (-self.row_height if up else self.row_height))
+
+    def _route_wheel(self, widget):
+        # Bound on every widget inside the list, including customtkinter's internal
+        # canvases, so the wheel scrolls the list the pointer is over
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            tkinter.Misc.bind(widget, sequence, self._on_wheel, add="+")
+        for child in widget.winfo_children():
+            self._route_wheel(child)